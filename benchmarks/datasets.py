@@ -0,0 +1,119 @@
+# benchmarks/datasets.py
+"""
+벤치마크용 정제 데이터셋 생성기입니다.
+data_processor.process_and_refine_data의 결과와 같은 컬럼 구성(원본 authorships / primary_location JSON 포함)을
+numpy 난수로 바로 만들어, 수십만 건도 원본 수집/정제 없이 재현 가능하게 준비합니다.
+"""
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# 생성한 데이터셋 보관 위치 (환경변수로 변경 가능)
+CACHE_DIR = os.environ.get("ALEXTEST_BENCH_CACHE", os.path.join(tempfile.gettempdir(), "alextest-bench"))
+
+COUNTRIES = ['US', 'CN', 'KR', 'JP', 'DE', 'GB', 'IN', 'FR', 'IT', 'TW', 'CA', 'SG', 'ES', 'AU', 'NL',
+             'CH', 'SE', 'BR', 'RU', 'IL', 'PL', 'BE', 'AT', 'DK', 'FI', 'NO', 'IE', 'PT', 'CZ', 'MX']
+KEYWORD_STEMS = ['memory', 'memristor', 'neuromorphic computing', 'resistive switching', 'ferroelectric',
+                 'spintronics', 'synapse', 'deep learning', 'phase change', 'oxide', 'thin film', 'transistor',
+                 'graphene', 'perovskite', 'in-memory computing', 'crossbar array', 'reservoir computing', 'quantum dot']
+YEARS = (2005, 2024)
+
+
+def zipf_choice(rng: np.random.Generator, n_items: int, size, exponent: float = 1.1) -> np.ndarray:
+    """실제 저자/기관/키워드 분포처럼 소수 항목에 빈도가 몰린 정수 표본을 뽑습니다."""
+    weights = 1.0 / np.arange(1, n_items + 1) ** exponent
+    return rng.choice(n_items, size=size, p=weights / weights.sum())
+
+
+def generate_refined_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """정제 파이프라인 결과와 같은 형식의 데이터셋 n_rows건을 만듭니다. (같은 seed면 항상 같은 데이터)"""
+    rng = np.random.default_rng(seed)
+    n_authors, n_insts, n_sources, n_topics = max(1000, n_rows // 2), max(200, n_rows // 100), max(50, n_rows // 2000), 200
+    keywords = KEYWORD_STEMS + [f"{stem} {i}" for i in range(max(1, n_rows // 500)) for stem in ('device', 'material', 'circuit')]
+    inst_country = zipf_choice(rng, len(COUNTRIES), n_insts, 0.9)
+
+    years = rng.integers(YEARS[0], YEARS[1] + 1, n_rows)
+    author_counts = rng.integers(1, 9, n_rows)
+    keyword_counts = rng.integers(0, 6, n_rows)
+    author_pool = zipf_choice(rng, n_authors, int(author_counts.sum()), 0.8)
+    inst_pool = zipf_choice(rng, n_insts, int(author_counts.sum()), 0.9)
+    keyword_pool = zipf_choice(rng, len(keywords), int(keyword_counts.sum()), 1.0)
+    sources = zipf_choice(rng, n_sources, n_rows, 0.9)
+    topics = zipf_choice(rng, n_topics, n_rows, 0.9)
+    has_corr = rng.random(n_rows) > 0.3
+    cited = rng.negative_binomial(1, 0.03, n_rows)
+    fwci = np.where(rng.random(n_rows) > 0.15, rng.lognormal(0, 0.8, n_rows).round(3), np.nan)
+    percentile = rng.random(n_rows).round(4)
+
+    columns = {name: [] for name in (
+        'First_Author_Name', 'First_Author_Institution', 'First_Author_Country', 'Corresponding_Author_Names',
+        'Corresponding_Institution_Names', 'All_Authors', 'All_Institutions', 'All_Countries',
+        'Keywords(Scores)', 'authorships', 'corresponding_author_ids')}
+    a_pos = k_pos = 0
+    for row in range(n_rows):
+        author_ids = list(dict.fromkeys(author_pool[a_pos:a_pos + author_counts[row]]))
+        inst_ids = inst_pool[a_pos:a_pos + len(author_ids)]
+        a_pos += author_counts[row]
+        authorships = [{
+            'author_position': 'first' if j == 0 else ('last' if j == len(author_ids) - 1 else 'middle'),
+            'author': {'id': f"https://openalex.org/A{a}", 'display_name': f"Author {a}"},
+            'institutions': [{'id': f"https://openalex.org/I{i}", 'display_name': f"Institution {i}", 'country_code': COUNTRIES[inst_country[i]]}],
+            'countries': [COUNTRIES[inst_country[i]]],
+        } for j, (a, i) in enumerate(zip(author_ids, inst_ids))]
+        names = [f"Author {a}" for a in author_ids]
+        insts = sorted({f"Institution {i}" for i in inst_ids})
+        countries = sorted({COUNTRIES[inst_country[i]] for i in inst_ids})
+        corr = [authorships[0]['author']['id']] if has_corr[row] else []
+
+        columns['First_Author_Name'].append(names[0])
+        columns['First_Author_Institution'].append(f"Institution {inst_ids[0]}")
+        columns['First_Author_Country'].append(COUNTRIES[inst_country[inst_ids[0]]])
+        columns['Corresponding_Author_Names'].append(names[0] if corr else '')
+        columns['Corresponding_Institution_Names'].append(f"Institution {inst_ids[0]}" if corr else '')
+        columns['All_Authors'].append("; ".join(names))
+        columns['All_Institutions'].append("; ".join(insts))
+        columns['All_Countries'].append("; ".join(countries))
+        kws = list(dict.fromkeys(keyword_pool[k_pos:k_pos + keyword_counts[row]]))
+        k_pos += keyword_counts[row]
+        columns['Keywords(Scores)'].append("; ".join(f"{keywords[k]} ({rng.random():.3f})" for k in kws))
+        columns['authorships'].append(json.dumps(authorships, ensure_ascii=False))
+        columns['corresponding_author_ids'].append(json.dumps(corr))
+
+    df = pd.DataFrame({
+        'doi': [f"https://doi.org/10.5555/bench.{i}" for i in range(n_rows)],
+        'id': [f"https://openalex.org/W{i}" for i in range(n_rows)],
+        'title': [f"Benchmark paper {i}" for i in range(n_rows)],
+        'publication_year': years,
+        'Journal_Name': [f"Journal {s}" for s in sources],
+        'Publisher': 'Benchmark Press',
+        'ISSN-L': [f"{s:04d}-0000" for s in sources],
+        **{col: columns[col] for col in ('First_Author_Name', 'First_Author_Institution', 'First_Author_Country',
+                                         'Corresponding_Author_Names', 'Corresponding_Institution_Names',
+                                         'All_Authors', 'All_Institutions', 'All_Countries')},
+        'Abstract': [f"We study {KEYWORD_STEMS[t % len(KEYWORD_STEMS)]} in benchmark paper {i}." for i, t in enumerate(topics)],
+        'Primary_Topic(Score)': [f"Topic {t} ({rng.random():.3f})" for t in topics],
+        'Top_Topics(Scores)': [f"Topic {t} (0.900); Topic {(t + 1) % n_topics} (0.500)" for t in topics],
+        'Keywords(Scores)': columns['Keywords(Scores)'],
+        'cited_by_count': cited,
+        'fwci': fwci,
+        'Citation_Percentile': percentile,
+        'Is_Top_1_Percent': percentile > 0.99,
+        'Is_Top_10_Percent': percentile > 0.9,
+        'authorships': columns['authorships'],
+        'corresponding_author_ids': columns['corresponding_author_ids'],
+        'primary_location': [json.dumps({'source': {'id': f"https://openalex.org/S{s}", 'display_name': f"Journal {s}"}}) for s in sources],
+    })
+    return df
+
+
+def load_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """생성한 데이터셋을 CACHE_DIR에 pickle로 보관해 두고, 다음 실행부터는 바로 읽습니다."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"refined_{n_rows}_{seed}.pkl")
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+    df = generate_refined_dataset(n_rows, seed)
+    df.to_pickle(path)
+    return df
@@ -0,0 +1,186 @@
+# benchmarks/run_benchmarks.py
+"""
+대시보드 성능 벤치마크: Streamlit AppTest로 앱을 화면 없이 실행하여,
+생성한 정제 데이터셋(기본 10k / 100k / 500k건)에서 탭별 첫 렌더링과 주요 상호작용 지연 시간, 최대 메모리를 측정합니다.
+
+    python benchmarks/run_benchmarks.py                          # 측정 후 baselines.json과 비교 (느려지면 종료 코드 1)
+    python benchmarks/run_benchmarks.py --sizes 10000 100000     # 일부 크기만 측정
+    python benchmarks/run_benchmarks.py --update-baseline        # 측정값을 새 기준값으로 저장
+
+데이터 크기마다 별도 프로세스(작업 디렉터리도 임시 폴더)에서 실행하므로, 캐시가 비어 있는 상태에서 시작하고
+최대 메모리(Unix: ru_maxrss, Windows: psutil이 있으면 peak_wset)도 크기별로 따로 측정됩니다.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "main.py")
+BASELINE_FILE = os.path.join(REPO_ROOT, "benchmarks", "baselines.json")
+
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+REPEATS = 3                 # 상호작용 측정 반복 횟수 (중앙값 사용)
+RUN_TIMEOUT = 1800          # AppTest 한 번 실행의 최대 시간(초)
+# 회귀 판정: 측정값 > 기준값 * (1 + 허용 비율) + 여유값 이면 느려진 것으로 봅니다.
+LATENCY_TOLERANCE = 0.30
+LATENCY_SLACK_MS = 50
+MEMORY_TOLERANCE = 0.15
+
+VIEW_BASIC = "📊 2. 기본 동향 분석"
+VIEW_COUNTRY = "🔬 3. 국가별 심층 분석"
+VIEW_KEYWORD = "✨ 4. 키워드 동향 분석"
+
+
+# --- 1. 작업 프로세스: 데이터 크기 하나를 측정 ---
+def timed_run(at, action=None) -> float:
+    """(위젯 조작 후) 앱을 한 번 다시 실행하고 걸린 시간(ms)을 반환합니다. 예외가 나면 중단합니다."""
+    start = time.perf_counter()
+    (action(at) if action else at).run(timeout=RUN_TIMEOUT)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"앱 실행 중 예외 발생: {at.exception[0].value}")
+    return elapsed_ms
+
+
+def median_of(at, actions: list) -> float:
+    return statistics.median(timed_run(at, action) for action in actions)
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리(MB)를 반환합니다. 측정할 수 없는 환경이면 None을 반환합니다."""
+    try:
+        import resource  # Unix 전용
+    except ImportError:
+        try:
+            import psutil  # (선택) Windows에서 최대 메모리 측정에 사용
+        except ImportError:
+            return None
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)
+        return peak / (1024 * 1024) if peak is not None else None
+    # Linux는 KB, macOS는 바이트 단위
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def run_worker(n_rows: int) -> dict:
+    """임시 작업 디렉터리에서 앱을 실행하며 시나리오별 지연 시간을 측정합니다."""
+    sys.path.insert(0, REPO_ROOT)
+    from streamlit.testing.v1 import AppTest
+    from benchmarks.datasets import load_dataset
+
+    df = load_dataset(n_rows)
+    top_countries = df['First_Author_Country'].value_counts().index[:REPEATS + 1].tolist()
+
+    # 데이터 폴더(data/...)만 임시 작업 디렉터리에 생깁니다. (워드클라우드 글꼴은 저장소 경로를 직접 사용)
+    work_dir = tempfile.mkdtemp(prefix="alextest-bench-")
+    os.chdir(work_dir)
+
+    results = {}
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=RUN_TIMEOUT)
+    results['startup'] = timed_run(at)
+    at.session_state['pending_action'] = ('UPLOAD_ACTION', (df, None))
+    results['upload'] = timed_run(at)
+
+    # 기본 동향
+    results['basic.first_render'] = timed_run(at, lambda at: at.radio(key='active_view').set_value(VIEW_BASIC))
+    results['basic.rerun'] = median_of(at, [None] * REPEATS)
+
+    # 국가별 심층 분석: 국가 변경, 협력국 수 슬라이더
+    results['country.first_render'] = timed_run(at, lambda at: at.radio(key='active_view').set_value(VIEW_COUNTRY))
+    results['country.change_country'] = median_of(at, [
+        (lambda at, code=code: at.selectbox(key='country_deepdive_selector').set_value(code)) for code in top_countries[1:]])
+    results['country.slider'] = median_of(at, [
+        (lambda at, value=value: at.slider(key='collab_slider').set_value(value)) for value in range(5, 5 + REPEATS)])
+
+    # 키워드 동향: 국가 선택, 핵심 기술(키워드) 선택
+    results['keyword.first_render'] = timed_run(at, lambda at: at.radio(key='active_view').set_value(VIEW_KEYWORD))
+    results['keyword.select_country'] = median_of(at, [
+        (lambda at, code=code: at.selectbox(key='deepdive_country_selector').set_value(code)) for code in top_countries[1:]])
+    keyword_options = at.selectbox(key='inst_keyword_select').options[1:REPEATS + 1]
+    results['keyword.select_keyword'] = median_of(at, [
+        (lambda at, kw=kw: at.selectbox(key='inst_keyword_select').set_value(kw)) for kw in keyword_options])
+
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    peak_mb = peak_rss_mb()
+    return {'latency_ms': {name: round(ms, 1) for name, ms in results.items()}, 'peak_rss_mb': round(peak_mb, 1) if peak_mb is not None else None}
+
+
+# --- 2. 기준값 비교 ---
+def compare(size: str, measured: dict, baseline: dict) -> list:
+    """기준값보다 허용 범위 이상 느려지거나 메모리를 더 쓴 항목을 [(항목, 측정값, 기준값), ...]으로 반환합니다."""
+    regressions = []
+    for name, ms in measured['latency_ms'].items():
+        base = baseline.get('latency_ms', {}).get(name)
+        if base is not None and ms > base * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS:
+            regressions.append((f"{size}/{name}", f"{ms:,.0f} ms", f"{base:,.0f} ms"))
+    base_mem = baseline.get('peak_rss_mb')
+    if base_mem is not None and measured['peak_rss_mb'] is not None and measured['peak_rss_mb'] > base_mem * (1 + MEMORY_TOLERANCE):
+        regressions.append((f"{size}/peak_rss", f"{measured['peak_rss_mb']:,.0f} MB", f"{base_mem:,.0f} MB"))
+    return regressions
+
+
+def print_table(size: str, measured: dict, baseline: dict):
+    peak = f"{measured['peak_rss_mb']:,.0f} MB" if measured['peak_rss_mb'] is not None else "측정 불가"
+    print(f"\n[{size}건] 최대 메모리 {peak} (기준 {baseline.get('peak_rss_mb', '-')})")
+    for name, ms in measured['latency_ms'].items():
+        base = baseline.get('latency_ms', {}).get(name)
+        ratio = f"{ms / base:5.2f}x" if base else "   - "
+        print(f"  {name:<28} {ms:>10,.0f} ms   기준 {base if base is not None else '-':>10}   {ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AlexTest 대시보드 성능 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--update-baseline', action='store_true', help="측정값을 baselines.json에 기준값으로 저장")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker)))
+        return
+
+    baselines = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    regressions = []
+    for n_rows in args.sizes:
+        print(f"-> {n_rows:,}건 측정 중...", flush=True)
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(n_rows)],
+                              capture_output=True, text=True, cwd=REPO_ROOT)
+        if proc.returncode != 0:
+            print(proc.stderr[-3000:])
+            sys.exit(f"{n_rows}건 측정 실패")
+        measured = json.loads(proc.stdout.strip().splitlines()[-1])
+        size = str(n_rows)
+        print_table(size, measured, baselines.get(size, {}))
+        if args.update_baseline:
+            baselines[size] = measured
+        else:
+            regressions += compare(size, measured, baselines.get(size, {}))
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n기준값을 저장했습니다: {BASELINE_FILE}")
+    elif regressions:
+        print("\n성능 회귀 발견:")
+        for name, value, base in regressions:
+            print(f"  {name}: {value} (기준 {base})")
+        sys.exit(1)
+    else:
+        print("\n모든 항목이 기준값 허용 범위 안에 있습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,10 @@
 # 파일 이름: main.py (전략 적용 후 수정된 버전)
 
 import streamlit as st
-import pandas as pd
+from modules import profiler, dataset_store
 
-# 각 탭의 render 함수를 import 합니다.
-import tab_search
-import tab_basic_dashboard
-import tab_country_deepdive  # 나중에 수정할 것이므로 일단 주석 처리
-import tab_deep_dashboard
+# 각 탭 모듈(plotly, wordcloud, scipy 등 무거운 의존성 포함)은 시작 시 import 하지 않고,
+# 해당 화면이 처음 선택될 때 profiler.import_view()로 불러옵니다.
 
 # ==============================================================================
 # ✨ 1. 상태(State) 초기화: 하나의 데이터 저장소와 하나의 액션 보관함으로 통합
@@ -16,15 +13,19 @@ st.set_page_config(layout="wide")
 
 def initialize_state():
     """앱 세션 상태를 초기화하는 함수"""
-    # 데이터는 종류에 상관없이 하나의 변수에 저장
-    if 'data' not in st.session_state:
-        st.session_state.data = pd.DataFrame()
+    # 데이터 자체는 프로세스 공용 저장소(dataset_store)에 두고, 세션은 지문(fingerprint)만 참조
     # 현재 데이터의 종류를 나타내는 '타입' 변수
     if 'data_type' not in st.session_state:
         st.session_state.data_type = None  # 'search' 또는 'analysis'가 될 예정
+    # 현재 데이터의 지문(fingerprint): 저장소 조회 및 데이터셋 버전별 캐시/내보내기 파일의 키로 사용
+    if 'data_fingerprint' not in st.session_state:
+        st.session_state.data_fingerprint = None
     # 탭에서 올린 처리 대기 중인 '액션'
     if 'pending_action' not in st.session_state:
         st.session_state.pending_action = None
+    # 보유 데이터 내 검색(로컬 필터) 상태: {'parent_fingerprint', 'description', 'matches'} 또는 None
+    if 'corpus_filter' not in st.session_state:
+        st.session_state.corpus_filter = None
 
 # 앱이 시작(또는 재로딩)될 때마다 상태 초기화 함수 실행
 initialize_state()
@@ -41,19 +42,49 @@ if st.session_state.pending_action is not None:
 
     if action_type == 'SEARCH_ACTION':
         # 검색 액션 처리
-        st.session_state.data = payload
+        st.session_state.data_fingerprint = dataset_store.get_dataset_store().put(payload)
         st.session_state.data_type = 'search'
+        st.session_state.corpus_filter = None
+        st.toast("데이터 수집 완료! 결과를 확인하고 엑셀로 다운로드하세요.")
+
+    elif action_type == 'SEARCH_JOB_ACTION':
+        # 백그라운드 검색 작업의 결과 처리 (데이터셋은 작업이 이미 공용 저장소에 등록해 두었으므로 지문만 받음)
+        st.session_state.data_fingerprint = payload
+        st.session_state.data_type = 'search'
+        st.session_state.corpus_filter = None
         st.toast("데이터 수집 완료! 결과를 확인하고 엑셀로 다운로드하세요.")
 
     elif action_type == 'UPLOAD_ACTION':
-        # 업로드 액션 처리
-        st.session_state.data = payload
+        # 업로드 액션 처리: (데이터프레임, 지문) - 지문이 None이면 저장소가 계산
+        new_df, fp = payload
+        st.session_state.data_fingerprint = dataset_store.get_dataset_store().put(new_df, fp=fp)
         st.session_state.data_type = 'analysis'
+        st.session_state.corpus_filter = None
         st.toast("파일 업로드 완료! 분석이 시작됩니다.")
 
+    elif action_type == 'FILTER_ACTION':
+        # 보유 데이터 내 검색 결과(하위 집합)를 새 데이터셋으로 등록하고, 분석 탭이 이를 사용하도록 전환
+        subset, parent_fingerprint, description = payload
+        st.session_state.data_fingerprint = dataset_store.get_dataset_store().put(subset)
+        st.session_state.corpus_filter = {'parent_fingerprint': parent_fingerprint, 'description': description, 'matches': len(subset)}
+        st.toast(f"검색 조건에 맞는 {len(subset):,}건으로 분석합니다.")
+
+    elif action_type == 'CLEAR_FILTER_ACTION':
+        # 필터를 해제하고 원래 전체 데이터셋으로 돌아감
+        st.session_state.data_fingerprint = payload
+        st.session_state.corpus_filter = None
+        st.toast("전체 데이터로 분석합니다.")
+
     # 액션 처리가 끝났으므로, 보관함을 비워서 중복 실행 방지
     st.session_state.pending_action = None
 
+# 이번 실행에서 사용할 데이터를 공용 저장소에서 꺼내옴 (디스크로 내보낸 경우 자동 복원)
+data = dataset_store.get_session_dataset()
+if data.empty and st.session_state.data_type is not None:
+    # 저장소에서 데이터셋을 찾을 수 없는 경우(예: 서버 재시작) 초기 상태로 되돌림
+    st.session_state.data_fingerprint = None
+    st.session_state.data_type = None
+
 
 # ==============================================================================
 # 3. 메인 앱 UI 렌더링
@@ -98,29 +129,36 @@ def render_home_tab():
 
 st.title("📚 논문 분석 시스템")
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "🏠 홈 (사용법)",
-    "🔍 1. 논문 검색",
-    "📊 2. 기본 동향 분석",
-    "🔬 3. 국가별 심층 분석",
-    "✨ 4. 키워드 동향 분석"
-])
-
-with tab1:
-    render_home_tab()
-
-with tab2:
+# st.tabs는 모든 탭의 본문을 매 실행마다 그리므로, 선택된 화면 하나만 실행하는 라우터를 사용합니다.
+# (분석 결과는 데이터셋 지문별로 캐싱되어 있으므로 화면을 바꿔도 다시 계산하지 않습니다)
+# 화면 이름 -> (탭 모듈 이름, render 호출). 홈 화면은 모듈 없이 이 파일에서 바로 그립니다.
+VIEWS = {
+    "🏠 홈 (사용법)": (None, lambda module: render_home_tab()),
     # ✨ 검색 탭에는 아무 인자도 전달할 필요가 없음.
     #    (액션 등록은 탭 내부에서 st.session_state를 통해 직접 하기 때문)
-    tab_search.render()
-
-with tab3:
+    "🔍 1. 논문 검색": ('tab_search', lambda module: module.render()),
     # ✨ 분석 탭에는 현재 '데이터'와 '데이터 타입'을 인자로 전달하여
     #    화면을 어떻게 그릴지 결정하게 함.
-    tab_basic_dashboard.render(st.session_state.data, st.session_state.data_type)
-
-with tab4:
-    tab_country_deepdive.render(st.session_state.data, st.session_state.data_type)
-
-with tab5:
-    tab_deep_dashboard.render(st.session_state.data, st.session_state.data_type)
\ No newline at end of file
+    "📊 2. 기본 동향 분석": ('tab_basic_dashboard', lambda module: module.render(data, st.session_state.data_type, st.session_state.data_fingerprint)),
+    "🔬 3. 국가별 심층 분석": ('tab_country_deepdive', lambda module: module.render(data, st.session_state.data_type, st.session_state.data_fingerprint)),
+    "✨ 4. 키워드 동향 분석": ('tab_deep_dashboard', lambda module: module.render(data, st.session_state.data_type, st.session_state.data_fingerprint)),
+}
+
+# 분석 모드에서는 사이드바에서 보유 데이터 안을 다시 검색해 분석 대상을 좁힐 수 있습니다.
+if st.session_state.data_type == 'analysis':
+    from modules import corpus_filter
+    corpus_filter.render_sidebar()
+
+# 선택된 화면은 세션 상태(active_view)에 저장되어, 업로드/검색 후 재실행되어도 유지됩니다.
+active_view = st.radio("화면 선택", list(VIEWS), horizontal=True, key="active_view", label_visibility="collapsed")
+st.markdown("---")
+view_module_name, render_view = VIEWS[active_view]
+# 재실행마다 화면 렌더링 구간을 계측합니다. (ALEXTEST_TRACE_RENDER / ALEXTEST_TRACE_OVERLAY로 켬)
+with profiler.render_run(active_view):
+    if view_module_name is None:
+        render_view(None)
+    else:
+        view_module = profiler.import_view(view_module_name)
+        with profiler.first_render(view_module_name):
+            render_view(view_module)
+profiler.render_report()
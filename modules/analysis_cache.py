@@ -0,0 +1,126 @@
+# modules/analysis_cache.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from modules import country_index, collaboration, country_metrics, keyword_index, leaderboard, duckdb_backend, summary, entity_index, text_index
+
+# 동시에 메모리에 보관할 데이터셋 버전 수 (분석 탭 공용)
+MAX_CACHED_DATASETS = 4
+
+
+# ==============================================================================
+# 데이터 클리닝 및 전처리 함수 (분석 탭 공용)
+# ==============================================================================
+def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 공백/결측 표기를 정리하고, 숫자 컬럼 변환 및 국가 리스트(country_list) 컬럼을 추가합니다."""
+    missing_values = ['nan', 'None', 'none', 'null', '']
+    for col in df.select_dtypes(include='object').columns:
+        df[col] = df[col].str.strip()
+        df[col] = df[col].replace(missing_values, np.nan)
+    numeric_cols = ['publication_year', 'cited_by_count', 'fwci', 'Citation_Percentile', 'Is_Top_10_Percent']
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if 'All_Countries' in df.columns:
+        df['All_Countries'] = df['All_Countries'].fillna('')
+        df['country_list'] = df['All_Countries'].str.split(';').apply(
+            lambda lst: sorted([country.strip() for country in lst if country.strip()])
+        )
+    else:
+        df['country_list'] = [[] for _ in range(len(df))]
+    return df
+
+
+# ==============================================================================
+# 지문(fingerprint) 기반 캐시
+# ==============================================================================
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="분석용 데이터를 준비하는 중...")
+def get_prepared_dataset(data_fingerprint: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    데이터셋 버전(지문)마다 한 번만 클리닝한 결과를 반환합니다.
+    모든 탭/세션이 같은 객체를 공유하므로, 반환된 데이터프레임은 수정하지 말고 읽기 전용으로 사용합니다.
+    """
+    print(f"-> 분석용 데이터 준비 중: {data_fingerprint}")
+    return clean_dataframe(_df.copy())
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="국가 색인을 만드는 중...")
+def get_country_index(data_fingerprint: str, _prepared_df: pd.DataFrame) -> country_index.CountryIndex:
+    """데이터셋 버전(지문)마다 한 번만 국가 -> 행 위치 역색인을 만듭니다."""
+    return country_index.build_country_index(_prepared_df['country_list'])
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="국가 간 협력 행렬을 계산하는 중...")
+def get_collaboration_matrix(data_fingerprint: str, _country_idx: country_index.CountryIndex) -> collaboration.CollaborationMatrix:
+    """데이터셋 버전(지문)마다 한 번만 전체 국가 간 공저 행렬을 계산합니다."""
+    return collaboration.build_collaboration_matrix(_country_idx)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="국가별 지표를 집계하는 중...")
+def get_country_metrics_cube(data_fingerprint: str, _prepared_df: pd.DataFrame, _country_idx: country_index.CountryIndex) -> country_metrics.CountryMetricsCube:
+    """데이터셋 버전(지문)마다 한 번만 국가 x 연도 지표 큐브를 만듭니다."""
+    return country_metrics.build_country_metrics_cube(_prepared_df, _country_idx)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="키워드 색인을 만드는 중...")
+def get_keyword_index(data_fingerprint: str, _prepared_df: pd.DataFrame) -> keyword_index.KeywordIndex:
+    """데이터셋 버전(지문)마다 한 번만 키워드 역색인과 키워드 x 연도 x 국가 빈도 큐브를 만듭니다."""
+    return keyword_index.build_keyword_index(_prepared_df)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS * 2, show_spinner="키워드별 선도 기관을 집계하는 중...")
+def get_keyword_leaderboard(data_fingerprint: str, _prepared_df: pd.DataFrame, _keyword_idx: keyword_index.KeywordIndex, entity_col: str) -> leaderboard.KeywordLeaderboard:
+    """데이터셋 버전(지문)마다 한 번만 키워드 x 개체(entity_col의 기관/국가 등) 논문 수 행렬을 만듭니다."""
+    return leaderboard.build_keyword_leaderboard(_keyword_idx, _prepared_df[entity_col])
+
+
+def release_duckdb_backend(backend):
+    if backend is not None:
+        duckdb_backend.release_backend(backend)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="DuckDB 분석 테이블을 만드는 중...", on_release=release_duckdb_backend)
+def get_duckdb_backend(data_fingerprint: str, _df: pd.DataFrame):
+    """
+    DuckDB 백엔드가 켜져 있으면, 데이터셋 버전(지문)마다 한 번만 만든 DuckDB 파일의 집계 객체를 반환합니다.
+    꺼져 있거나 duckdb가 설치되지 않은 경우 None을 반환하며, 이때 각 탭은 pandas로 집계합니다.
+    캐시에서 밀려나면 연결을 닫고 파일을 지웁니다. (_df는 클리닝 전/후 어느 쪽이어도 됨)
+    """
+    if not duckdb_backend.is_enabled():
+        return None
+    return duckdb_backend.open_backend(data_fingerprint, _df)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="저자/기관 개체 테이블을 만드는 중...")
+def get_entity_index(data_fingerprint: str, _df: pd.DataFrame):
+    """OpenAlex ID 기준 개체 테이블(정수 코드)을 데이터셋 버전(지문)마다 한 번만 만듭니다. (원본 authorships가 없으면 None)"""
+    return entity_index.build_entity_index(_df)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="제목/초록/키워드 검색 색인을 만드는 중...")
+def get_text_index(data_fingerprint: str, _df: pd.DataFrame) -> text_index.TextIndex:
+    """데이터셋 버전(지문)마다 한 번만 로컬 전문 검색 역색인을 만듭니다."""
+    return text_index.build_text_index(_df)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner="기본 동향 요약을 계산하는 중...")
+def get_live_summary(data_fingerprint: str, _df: pd.DataFrame) -> dict:
+    """
+    데이터에 저장된 요약이 없거나 오래된 경우, 데이터셋 버전(지문)마다 한 번만 요약을 새로 계산합니다.
+    DuckDB 백엔드가 켜져 있으면 SQL로, 아니면 pandas로 집계합니다.
+    """
+    entities = get_entity_index(data_fingerprint, _df)
+    if duckdb_backend.is_enabled():
+        backend = get_duckdb_backend(data_fingerprint, _df)
+        return summary.compute_summary_with_backend(_df, backend, entities)
+    return summary.compute_summary(_df, entities)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_DATASETS, show_spinner=False)
+def get_dashboard_summary(data_fingerprint: str, _df: pd.DataFrame) -> dict:
+    """
+    정제 단계에서 만들어 파일에 함께 저장한 요약이 현재 데이터의 것이면 그대로, 아니면 새로 계산한 요약을 반환합니다.
+    저장된 요약의 유효성 확인(전체 값 해싱)도 데이터셋 버전(지문)마다 한 번만 합니다.
+    """
+    stored = summary.get_fresh_summary(_df)
+    return stored if stored is not None else get_live_summary(data_fingerprint, _df)
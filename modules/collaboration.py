@@ -0,0 +1,69 @@
+# modules/collaboration.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from modules.country_index import CountryIndex
+
+
+class CollaborationMatrix:
+    """
+    국가 x 국가 공저(co-authorship) 행렬입니다.
+    대각 성분은 국가별 논문 수, 비대각 성분은 두 국가가 함께 참여한 논문 수입니다.
+    """
+
+    def __init__(self, codes: list, matrix: sparse.csr_matrix):
+        self.codes = codes
+        self.matrix = matrix
+        self._positions = {code: i for i, code in enumerate(codes)}
+
+    def submatrix(self, codes: list) -> pd.DataFrame:
+        """선택한 국가들 사이의 협력 논문 수 행렬을 반환합니다. (대각 성분은 0)"""
+        codes = [code for code in codes if code in self._positions]
+        ids = [self._positions[code] for code in codes]
+        block = self.matrix[ids][:, ids].toarray()
+        np.fill_diagonal(block, 0)
+        return pd.DataFrame(block, index=codes, columns=codes)
+
+    def partner_counts(self, code: str) -> pd.Series:
+        """해당 국가와 함께 참여한 논문 수를 협력국별로 반환합니다. (많은 순)"""
+        i = self._positions.get(code)
+        if i is None:
+            return pd.Series(dtype='int64')
+        row = self.matrix.getrow(i).toarray().ravel()
+        row[i] = 0
+        counts = pd.Series(row, index=self.codes)
+        return counts[counts > 0].sort_values(ascending=False)
+
+
+def build_collaboration_matrix(country_idx: CountryIndex) -> CollaborationMatrix:
+    """
+    논문 x 국가 희소 발생(incidence) 행렬 X를 만든 뒤, X^T X 한 번으로
+    전체 국가 간 공저 행렬을 계산합니다.
+    """
+    row_positions, code_ids = country_idx.postings()
+    incidence = sparse.csr_matrix(
+        (np.ones(len(row_positions), dtype=np.int32), (row_positions, code_ids)),
+        shape=(country_idx.n_rows, len(country_idx.codes)),
+    )
+    # 한 논문에 같은 국가가 중복 기록된 경우에도 한 번만 세도록 0/1로 맞춥니다.
+    incidence.data[:] = 1
+    co_matrix = (incidence.T @ incidence).tocsr()
+    return CollaborationMatrix(country_idx.codes, co_matrix)
+
+
+def partner_year_counts(country_idx: CountryIndex, years: np.ndarray, code: str, partners: list) -> pd.DataFrame:
+    """
+    대상국과 각 협력국이 함께 참여한 논문 수를 (협력국, 연도)별로 한 번에 집계합니다.
+    years는 행 위치 순서의 발행 연도 배열입니다. (결측은 NaN)
+    """
+    row_positions, code_ids = country_idx.postings()
+    in_target = np.zeros(country_idx.n_rows, dtype=bool)
+    in_target[country_idx.rows(code)] = True
+    codes = np.asarray(country_idx.codes, dtype=object)
+    is_partner = np.isin(codes, [partner for partner in partners if partner != code])
+
+    keep = in_target[row_positions] & is_partner[code_ids]
+    pairs = pd.DataFrame({'row': row_positions[keep], 'partner': codes[code_ids[keep]]}).drop_duplicates()
+    pairs['publication_year'] = years[pairs['row'].to_numpy()]
+    pairs = pairs.dropna(subset=['publication_year'])
+    return pairs.groupby(['partner', 'publication_year']).size().reset_index(name='count')
@@ -0,0 +1,74 @@
+# modules/corpus_filter.py
+import pandas as pd
+import streamlit as st
+from modules import dataset_store
+
+SEARCH_MODES = {'넓게 검색 (포괄적)': 'broad', '정확하게 검색 (핵심적)': 'precise'}
+TOP_PREVIEW = 5   # 사이드바에 보여줄 상위 논문 수
+
+
+def split_keywords(text: str) -> list:
+    """url_builder.prepare_params와 같이 쉼표로 구분된 검색어 목록으로 나눕니다."""
+    return [k.strip() for k in text.split(',') if k.strip()]
+
+
+def render_sidebar():
+    """
+    분석 중인 데이터(검색 결과 전체) 안에서 다시 검색해 하위 집합만 분석 탭에 넘기는 사이드바 입력창입니다.
+    OpenAlex에 새로 요청하지 않고, 데이터셋마다 한 번 만든 로컬 역색인(text_index)으로 바로 걸러냅니다.
+    """
+    if st.session_state.get('data_type') != 'analysis':
+        return
+    active = st.session_state.get('corpus_filter')
+    # 필터가 적용된 상태에서도 항상 원래 전체 데이터를 기준으로 다시 검색합니다.
+    parent_fingerprint = active['parent_fingerprint'] if active else st.session_state.data_fingerprint
+    parent_df = dataset_store.get_dataset_store().get(parent_fingerprint)
+    if parent_df is None or parent_df.empty:
+        return
+
+    with st.sidebar:
+        st.subheader("🔎 보유 데이터 내 검색")
+        if active:
+            st.success(f"필터 적용 중: {active['matches']:,} / {len(parent_df):,}건\n\n{active['description']}")
+            if st.button("필터 해제 (전체 데이터로)", use_container_width=True, key="corpus_filter_clear"):
+                st.session_state.pending_action = ('CLEAR_FILTER_ACTION', parent_fingerprint)
+                st.rerun()
+
+        years = pd.to_numeric(parent_df['publication_year'], errors='coerce').dropna() if 'publication_year' in parent_df.columns else pd.Series(dtype=float)
+        with st.form("corpus_filter_form"):
+            or_text = st.text_input("OR 키워드 (쉼표로 구분)", key="corpus_filter_or")
+            and_text = st.text_input("AND 키워드 (쉼표로 구분)", key="corpus_filter_and")
+            mode_label = st.radio("검색 범위", list(SEARCH_MODES), key="corpus_filter_mode")
+            year_range = None
+            if not years.empty and years.min() < years.max():
+                year_range = st.slider("발행 연도", int(years.min()), int(years.max()), (int(years.min()), int(years.max())), key="corpus_filter_years")
+                # 전체 범위 그대로면 연도 조건을 걸지 않습니다. (연도가 없는 논문도 포함)
+                if year_range == (int(years.min()), int(years.max())):
+                    year_range = None
+            submitted = st.form_submit_button("검색 결과로 분석하기", type="primary", use_container_width=True)
+
+        if submitted:
+            # 색인 생성(analysis_cache -> text_index, scipy)은 실제로 검색할 때만 불러옵니다.
+            from modules import analysis_cache
+            or_keywords, and_keywords = split_keywords(or_text), split_keywords(and_text)
+            index = analysis_cache.get_text_index(parent_fingerprint, parent_df)
+            rows, scores = index.search(or_keywords, and_keywords, SEARCH_MODES[mode_label], year_range)
+            if rows.size == 0:
+                st.warning("조건에 맞는 논문이 없습니다.")
+                return
+            description = " · ".join(filter(None, [
+                f"OR: {', '.join(or_keywords)}" if or_keywords else "",
+                f"AND: {', '.join(and_keywords)}" if and_keywords else "",
+                f"{year_range[0]}–{year_range[1]}" if year_range else "",
+            ])) or "전체"
+            # 관련도(BM25) 높은 순으로 정렬된 하위 집합이 그대로 분석 탭의 데이터가 됩니다.
+            subset = parent_df.iloc[rows].reset_index(drop=True)
+            st.session_state.corpus_filter_top = [
+                (str(title), float(score)) for title, score in zip(subset['title'].head(TOP_PREVIEW) if 'title' in subset.columns else [], scores[:TOP_PREVIEW])]
+            st.session_state.pending_action = ('FILTER_ACTION', (subset, parent_fingerprint, description))
+            st.rerun()
+
+        if active and st.session_state.get('corpus_filter_top'):
+            with st.expander("관련도 상위 논문 (BM25)"):
+                for title, score in st.session_state.corpus_filter_top:
+                    st.caption(f"{score:.2f} · {title}")
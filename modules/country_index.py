@@ -0,0 +1,65 @@
+# modules/country_index.py
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+
+class CountryIndex:
+    """
+    국가 코드 -> 해당 국가가 참여한 논문의 행 위치(오름차순 정수 배열) 역색인입니다.
+    국가별 부분집합, 교집합(대상국 ∩ 협력국), 합집합(네트워크 국가들)을 모두 배열 연산으로 계산합니다.
+    """
+
+    def __init__(self, codes: list, offsets: np.ndarray, rows: np.ndarray, row_country_counts: np.ndarray):
+        self.codes = codes                            # 정렬된 국가 코드 목록
+        self.n_rows = len(row_country_counts)          # 전체 논문(행) 수
+        self.row_country_counts = row_country_counts   # 행별 참여 국가 수
+        self._offsets = offsets                        # 국가 i의 행 위치: rows[offsets[i]:offsets[i+1]]
+        self._rows = rows
+        self._positions = {code: i for i, code in enumerate(codes)}
+
+    def __contains__(self, code) -> bool:
+        return code in self._positions
+
+    def rows(self, code: str) -> np.ndarray:
+        """해당 국가가 참여한 논문의 행 위치를 반환합니다."""
+        i = self._positions.get(code)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        return self._rows[self._offsets[i]:self._offsets[i + 1]]
+
+    def intersect(self, *codes) -> np.ndarray:
+        """모든 국가가 함께 참여한 논문의 행 위치를 반환합니다."""
+        result = self.rows(codes[0])
+        for code in codes[1:]:
+            result = np.intersect1d(result, self.rows(code), assume_unique=True)
+        return result
+
+    def union(self, codes) -> np.ndarray:
+        """국가들 중 하나라도 참여한 논문의 행 위치를 반환합니다."""
+        arrays = [self.rows(code) for code in codes]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays))
+
+    def postings(self) -> tuple:
+        """(행 위치, 국가 번호) 쌍 전체를 반환합니다. 희소 행렬 구성에 사용합니다."""
+        code_ids = np.repeat(np.arange(len(self.codes), dtype=np.int64), np.diff(self._offsets))
+        return self._rows, code_ids
+
+    def paper_counts(self) -> pd.Series:
+        """국가별 참여 논문 수를 반환합니다."""
+        return pd.Series(np.diff(self._offsets), index=self.codes)
+
+
+def build_country_index(country_lists: pd.Series) -> CountryIndex:
+    """행별 국가 코드 리스트(country_list 컬럼)로부터 국가 역색인을 한 번에 만듭니다."""
+    lengths = country_lists.str.len().fillna(0).to_numpy(dtype=np.int64)
+    row_positions = np.repeat(np.arange(len(country_lists), dtype=np.int64), lengths)
+    flat_codes = list(chain.from_iterable(lst for lst in country_lists if isinstance(lst, list)))
+
+    code_ids, codes = pd.factorize(pd.Series(flat_codes, dtype=object), sort=True)
+    # 안정 정렬이므로 국가별 행 위치는 오름차순으로 유지됩니다.
+    order = np.argsort(code_ids, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(code_ids, minlength=len(codes)))])
+    return CountryIndex(list(codes), offsets, row_positions[order], lengths)
@@ -0,0 +1,93 @@
+# modules/country_metrics.py
+import numpy as np
+import pandas as pd
+from modules.country_index import CountryIndex
+
+# 큐브에 담기는 (국가, 연도)별 합계 지표
+METRIC_COLUMNS = ['papers', 'citations', 'fwci_sum', 'fwci_count', 'top10_count', 'top10_valid', 'intl_collab']
+
+
+class CountryMetricsCube:
+    """
+    국가 x 연도 지표 큐브입니다. 논문 수, 피인용 합, FWCI 합/개수, Top 10% 논문 수,
+    국제 협력 논문 수를 한 번에 집계해 두고, KPI/세계 순위/추세/CAGR을 여기서 바로 읽습니다.
+    """
+
+    def __init__(self, cube: pd.DataFrame, global_collab_rate: float, has_top10: bool):
+        self.cube = cube                              # MultiIndex (country, publication_year)
+        self.global_collab_rate = global_collab_rate  # 전체 데이터의 국제 협력 비율(%)
+        self.has_top10 = has_top10
+        # 연도 결측 행까지 포함한 국가별 전체 합계
+        self.totals = cube.groupby(level='country').sum()
+        self.paper_ranks = self.totals['papers'].rank(method='first', ascending=False)
+        self.citation_ranks = self.totals['citations'].rank(method='first', ascending=False)
+
+    def kpis(self, code: str) -> dict:
+        """국가의 핵심 지표(KPI)와 세계 순위를 반환합니다."""
+        if code not in self.totals.index:
+            return {}
+        row = self.totals.loc[code]
+        return {
+            'total_papers': int(row['papers']),
+            'world_rank_papers': int(self.paper_ranks[code]),
+            'total_citations': int(row['citations']),
+            'world_rank_citations': int(self.citation_ranks[code]),
+            'avg_fwci': row['fwci_sum'] / row['fwci_count'] if row['fwci_count'] else np.nan,
+            'top_10_percent_rate': row['top10_count'] / row['top10_valid'] * 100 if self.has_top10 and row['top10_valid'] else 0,
+            'international_collab_rate': row['intl_collab'] / row['papers'] * 100 if row['papers'] else 0,
+            'global_collab_rate': self.global_collab_rate,
+        }
+
+    def metric_pivot(self, codes: list, metric: str = 'papers') -> pd.DataFrame:
+        """연도 x 국가 지표 표를 반환합니다. 데이터가 없는 연도는 0으로 채웁니다."""
+        codes = [code for code in codes if code in self.totals.index]
+        if not codes:
+            return pd.DataFrame()
+        pivot = self.cube.loc[codes, metric].unstack(level='country', fill_value=0)
+        pivot = pivot[pivot.index.notna()]
+        if pivot.empty:
+            return pivot
+        years = range(int(pivot.index.min()), int(pivot.index.max()) + 1)
+        pivot = pivot.reindex(years, fill_value=0)
+        pivot.index.name = 'publication_year'
+        pivot.columns.name = 'country'
+        return pivot[codes]
+
+
+def build_country_metrics_cube(df: pd.DataFrame, country_idx: CountryIndex) -> CountryMetricsCube:
+    """국가 역색인의 (행, 국가) 쌍을 한 번에 집계하여 국가 x 연도 지표 큐브를 만듭니다."""
+    row_positions, code_ids = country_idx.postings()
+    n = len(df)
+
+    def column_values(col):
+        if col not in df.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+
+    fwci = column_values('fwci')[row_positions]
+    top10 = column_values('Is_Top_10_Percent')[row_positions]
+    postings = pd.DataFrame({
+        'country': np.asarray(country_idx.codes, dtype=object)[code_ids],
+        'publication_year': column_values('publication_year')[row_positions],
+        'papers': 1,
+        'citations': np.nan_to_num(column_values('cited_by_count')[row_positions]),
+        'fwci_sum': np.nan_to_num(fwci),
+        'fwci_count': ~np.isnan(fwci),
+        'top10_count': np.nan_to_num(top10),
+        'top10_valid': ~np.isnan(top10),
+        'intl_collab': country_idx.row_country_counts[row_positions] > 1,
+    })
+    cube = postings.groupby(['country', 'publication_year'], dropna=False)[METRIC_COLUMNS].sum()
+    global_collab_rate = (country_idx.row_country_counts > 1).mean() * 100 if n else 0
+    return CountryMetricsCube(cube, global_collab_rate, 'Is_Top_10_Percent' in df.columns)
+
+
+def calculate_cagr(pivot_df: pd.DataFrame, start_year: int, end_year: int) -> pd.Series:
+    """연도 x 국가 표에서 모든 국가의 연평균 성장률(CAGR, %)을 한 번에 계산합니다."""
+    num_years = end_year - start_year
+    if num_years <= 0:
+        return pd.Series(dtype=float)
+    start_values = pivot_df.loc[start_year].astype(float)
+    end_values = pivot_df.loc[end_year].astype(float)
+    cagr = ((end_values / start_values) ** (1 / num_years) - 1) * 100
+    return cagr.where(start_values > 0)
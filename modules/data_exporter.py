@@ -0,0 +1,128 @@
+# modules/data_exporter.py
+import json
+import os
+import shutil
+import tempfile
+import threading
+import pandas as pd
+from modules import summary
+
+try:
+    import pyarrow  # noqa: F401  (Parquet 저장에 필요)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_DIR = os.path.join("data", "exports")
+EXPORT_BASENAME = "refined_paper_data"
+MAX_EXPORT_DATASETS = 16   # 내보내기 파일을 보관할 데이터셋(지문) 수 (LRU)
+_evict_lock = threading.Lock()
+
+# 형식별 (파일 확장자, MIME 타입, 버튼 라벨)
+EXPORT_FORMATS = {
+    'xlsx': ('xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "엑셀"),
+    'csv': ('csv.gz', "application/gzip", "CSV (gzip 압축)"),
+    'parquet': ('parquet', "application/vnd.apache.parquet", "Parquet"),
+}
+
+# 스트리밍 엑셀 저장 시 한 번에 변환할 행 수
+XLSX_CHUNK_ROWS = 5000
+# 대시보드 요약(JSON)을 담는 엑셀 메타데이터 시트 이름
+SUMMARY_SHEET = '_summary'
+
+
+# --- 1. 형식별 저장 함수 ---
+def write_xlsx_streaming(df: pd.DataFrame, path: str, sheet_name: str = 'Sheet1'):
+    """openpyxl의 write-only 모드로 행을 흘려 쓰므로, 데이터 크기와 무관하게 메모리 사용량이 일정합니다."""
+    from openpyxl import Workbook  # 엑셀 파일을 만들 때만 불러옵니다. (앱 시작 시간 단축)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    ws.append([str(col) for col in df.columns])
+
+    for start in range(0, len(df), XLSX_CHUNK_ROWS):
+        chunk = df.iloc[start:start + XLSX_CHUNK_ROWS].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+
+    # 정제 단계에서 계산한 대시보드 요약이 있으면 별도 시트에 JSON으로 함께 저장합니다.
+    if summary.SUMMARY_ATTR in df.attrs:
+        meta_ws = wb.create_sheet(title=SUMMARY_SHEET)
+        meta_ws.append(['key', 'value'])
+        meta_ws.append([summary.SUMMARY_ATTR, json.dumps(df.attrs[summary.SUMMARY_ATTR], ensure_ascii=False)])
+
+    wb.save(path)
+
+
+def write_csv_gz(df: pd.DataFrame, path: str):
+    """gzip으로 압축된 CSV 파일을 저장합니다. (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    df.to_csv(path, index=False, encoding='utf-8-sig', compression='gzip')
+
+
+def write_parquet(df: pd.DataFrame, path: str):
+    """Parquet 파일을 저장합니다. (pyarrow가 설치된 경우에만 사용 가능, 대시보드 요약은 df.attrs로 메타데이터에 함께 저장됨)"""
+    df.to_parquet(path, index=False, engine='pyarrow')
+
+
+WRITERS = {
+    'xlsx': write_xlsx_streaming,
+    'csv': write_csv_gz,
+    'parquet': write_parquet,
+}
+
+
+# --- 2. 지문(fingerprint) 기반 파일 관리 ---
+def available_formats() -> list:
+    """현재 환경에서 저장 가능한 형식 목록을 반환합니다."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or PYARROW_AVAILABLE]
+
+
+def get_export_path(fingerprint: str, fmt: str) -> str:
+    """데이터셋 지문과 형식에 해당하는 내보내기 파일 경로를 반환합니다."""
+    extension = EXPORT_FORMATS[fmt][0]
+    return os.path.join(EXPORT_DIR, fingerprint, f"{EXPORT_BASENAME}.{extension}")
+
+
+def build_exports(df: pd.DataFrame, fingerprint: str, formats: list = None) -> dict:
+    """
+    데이터셋 버전(지문)마다 한 번만 내보내기 파일을 만들어 디스크에 저장합니다.
+    이미 만들어진 파일은 다시 만들지 않으며, {형식: 파일 경로} 딕셔너리를 반환합니다.
+    """
+    paths = {}
+    for fmt in formats or available_formats():
+        path = get_export_path(fingerprint, fmt)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 세션/작업 스레드가 쓰다 만 파일을 내려받거나 덮어쓰지 않도록, 호출마다 고유한 임시 파일에 쓴 뒤 교체합니다.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{EXPORT_BASENAME}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                print(f"-> 내보내기 파일 생성 중: {path}")
+                WRITERS[fmt](df, tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"경고: '{fmt}' 형식 내보내기 실패: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                continue
+        paths[fmt] = path
+    if paths:
+        os.utime(os.path.dirname(next(iter(paths.values()))))  # LRU: 최근 사용 시각 갱신
+        evict_old_exports(keep=fingerprint)
+    return paths
+
+
+def evict_old_exports(keep: str = None, max_entries: int = MAX_EXPORT_DATASETS):
+    """내보내기 폴더가 max_entries개를 넘으면 가장 오래 사용하지 않은 데이터셋의 폴더부터 지웁니다. (keep은 제외)"""
+    with _evict_lock:
+        if not os.path.isdir(EXPORT_DIR):
+            return
+        dirs = [os.path.join(EXPORT_DIR, name) for name in os.listdir(EXPORT_DIR) if name != keep]
+        dirs = [path for path in dirs if os.path.isdir(path)]
+        excess = len(dirs) + (1 if keep else 0) - max_entries
+        if excess <= 0:
+            return
+        dirs.sort(key=os.path.getmtime)
+        for old_dir in dirs[:excess]:
+            print(f"-> 오래된 내보내기 파일 삭제: {old_dir}")
+            shutil.rmtree(old_dir, ignore_errors=True)
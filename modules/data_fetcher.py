@@ -1,81 +1,69 @@
 # modules/data_fetcher.py
 import requests
-import json
 import time
 import math
-from datetime import datetime
-import streamlit as st # Streamlit의 위젯을 사용하기 위해 import
+from modules import raw_index
 
-def fetch_and_save_incrementally(api_url: str, filename: str):
-    """
-    OpenAlex API에서 데이터를 가져와 즉시 파일에 추가하고,
-    Streamlit 화면에 프로그레스 바와 진행 상황 텍스트를 직접 출력합니다.
-    """
-    start_time = datetime.now()
-    st.info(f"데이터 수집을 시작합니다... (시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')})")
-
-    try:
-        response_p1 = requests.get(api_url)
-        response_p1.raise_for_status()
-        data_p1 = response_p1.json()
+# API 요청 제한 시간(초): (연결, 응답 읽기). 응답이 멈춘 요청이 작업 스레드를 무한정 붙잡지 않도록 합니다.
+REQUEST_TIMEOUT = (10, 60)
 
-        total_results = data_p1['meta']['count']
-        per_page = data_p1['meta']['per_page']
 
-        if total_results == 0:
-            st.warning("검색 결과가 없습니다.")
-            return
+class HarvestCancelled(Exception):
+    """수집 도중 취소 요청이 들어온 경우 발생합니다."""
 
-        total_pages = math.ceil(total_results / per_page)
-        st.write(f"총 {total_results}개의 결과를 {total_pages} 페이지에 걸쳐 '{filename}' 파일에 저장합니다.")
 
-        # 파일을 'w'(쓰기) 모드로 열어서, 실행할 때마다 새로 만듭니다.
-        with open(filename, 'w', encoding='utf-8') as f:
-            results_p1 = data_p1.get('results', [])
-            for work in results_p1:
-                f.write(json.dumps(work, ensure_ascii=False) + '\n')
+def harvest(api_url: str, filename: str, on_progress=None, should_cancel=None, on_page=None) -> int:
+    """
+    OpenAlex API에서 모든 페이지를 가져와 즉시 파일에 추가합니다. (Streamlit에 의존하지 않는 핵심 로직)
+    on_progress(items_saved, total_results)는 페이지마다 호출되고,
+    on_page(results)는 방금 저장한 페이지의 레코드 목록으로 호출됩니다. (수집 중 실시간 요약 갱신용)
+    should_cancel()이 True를 반환하면 다음 페이지를 요청하기 전에 HarvestCancelled를 발생시킵니다.
+    원본은 바이너리 모드로 쓰며, 같은 순서로 논문 ID -> (바이트 위치, 길이) 사이드카 색인(raw_index)도 함께 기록합니다.
+    저장한 논문 수를 반환합니다. (검색 결과가 없으면 0)
+    """
+    response_p1 = requests.get(api_url, timeout=REQUEST_TIMEOUT)
+    response_p1.raise_for_status()
+    data_p1 = response_p1.json()
 
-            items_saved = len(results_p1)
+    total_results = data_p1['meta']['count']
+    per_page = data_p1['meta']['per_page']
 
-            # ★★★ Streamlit용 진행 상황 표시 위젯 생성 ★★★
-            progress_bar = st.progress(0) # 0%에서 시작하는 프로그레스 바
-            status_text = st.empty() # 진행 상황 텍스트를 덮어쓸 빈 공간
+    if total_results == 0:
+        return 0
 
-            # 첫 페이지 진행률 업데이트
-            progress_bar.progress(items_saved / total_results)
-            status_text.text(f"수집 진행률: {items_saved} / {total_results} 건")
+    total_pages = math.ceil(total_results / per_page)
+    print(f"총 {total_results}개의 결과를 {total_pages} 페이지에 걸쳐 '{filename}' 파일에 저장합니다.")
 
-            # 두 번째 페이지부터 마지막까지 반복
-            for page_num in range(2, total_pages + 1):
-                paginated_url = f"{api_url}&page={page_num}"
-                response = requests.get(paginated_url)
-                response.raise_for_status()
-                page_data = response.json()
+    # 파일을 'wb'(바이너리 쓰기) 모드로 열어서, 실행할 때마다 새로 만듭니다. (줄바꿈 변환이 없어 바이트 위치가 정확함)
+    with open(filename, 'wb') as f, raw_index.IndexWriter(f, raw_index.sidecar_path(filename)) as index_writer:
+        results_p1 = data_p1.get('results', [])
+        index_writer.write_page(results_p1)
 
-                page_results = page_data.get('results', [])
-                if not page_results:
-                    st.error(f"\n{page_num}페이지에서 데이터를 가져오는데 실패했습니다.")
-                    break
+        items_saved = len(results_p1)
+        if on_page: on_page(results_p1)
+        if on_progress: on_progress(items_saved, total_results)
 
-                for work in page_results:
-                    f.write(json.dumps(work, ensure_ascii=False) + '\n')
+        # 두 번째 페이지부터 마지막까지 반복
+        for page_num in range(2, total_pages + 1):
+            if should_cancel and should_cancel():
+                raise HarvestCancelled(f"{items_saved}건 수집 후 취소되었습니다.")
 
-                items_saved += len(page_results)
+            paginated_url = f"{api_url}&page={page_num}"
+            response = requests.get(paginated_url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            page_data = response.json()
 
-                # ★★★ 프로그레스 바와 텍스트 업데이트 ★★★
-                progress_bar.progress(items_saved / total_results)
-                status_text.text(f"수집 진행률: {items_saved} / {total_results} 건")
+            page_results = page_data.get('results', [])
+            if not page_results:
+                print(f"경고: {page_num}페이지에서 데이터를 가져오는데 실패했습니다.")
+                break
 
-                time.sleep(0.1)
+            index_writer.write_page(page_results)
 
-        end_time = datetime.now()
-        elapsed_time = end_time - start_time
+            items_saved += len(page_results)
+            if on_page: on_page(page_results)
+            if on_progress: on_progress(items_saved, total_results)
 
-        status_text.text(f"수집 완료! 총 {items_saved}건") # 최종 메시지로 업데이트
-        st.success(f"작업 완료! 총 {items_saved}개의 데이터를 성공적으로 저장했습니다.")
-        st.write(f"총 소요 시간: {elapsed_time}")
+            time.sleep(0.1)
 
-    except requests.exceptions.RequestException as e:
-        st.error(f"API 요청 중 에러가 발생했습니다: {e}")
-    except Exception as e:
-        st.error(f"알 수 없는 오류가 발생했습니다: {e}")
\ No newline at end of file
+    return items_saved
@@ -0,0 +1,116 @@
+# modules/data_ingest.py
+import hashlib
+import io
+import json
+import pandas as pd
+import streamlit as st
+from modules import dataset_store, data_exporter, summary
+
+try:
+    import pyarrow  # noqa: F401  (멀티스레드 CSV 파서 / Parquet 읽기에 사용)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import python_calamine  # noqa: F401  (Rust 기반의 빠른 엑셀 파서)
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# 정제 파일(finalize_dataframe 결과)의 문자열 컬럼: 타입 추론을 생략하고 문자열로 바로 읽습니다.
+TEXT_COLUMNS = [
+    'doi', 'id', 'title', 'Journal_Name', 'Publisher', 'ISSN-L',
+    'First_Author_Name', 'First_Author_Institution', 'First_Author_Country',
+    'Corresponding_Author_Names', 'Corresponding_Institution_Names', 'Corresponding_Author_Countries',
+    'All_Authors', 'All_Institutions', 'All_Countries',
+    'Abstract', 'Primary_Topic(Score)', 'Top_Topics(Scores)', 'Keywords(Scores)',
+]
+# 숫자 컬럼: 읽은 뒤 한 번만 숫자로 변환합니다.
+NUMERIC_COLUMNS = ['publication_year', 'cited_by_count', 'fwci', 'Citation_Percentile']
+
+
+def content_hash(raw: bytes) -> str:
+    """업로드 파일 내용 전체의 해시값을 계산합니다."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def parse_file(raw: bytes, file_name: str) -> pd.DataFrame:
+    """파일 형식에 맞는 가장 빠른 엔진과 명시적 dtype으로 업로드 파일을 읽습니다."""
+    buffer = io.BytesIO(raw)
+    name = file_name.lower()
+    text_dtypes = {col: object for col in TEXT_COLUMNS}
+
+    if name.endswith('.parquet'):
+        df = pd.read_parquet(buffer)
+    elif name.endswith('.xlsx'):
+        engine = 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+        with pd.ExcelFile(buffer, engine=engine) as workbook:
+            df = workbook.parse(workbook.sheet_names[0], dtype=text_dtypes)
+            # 내보내기 때 함께 저장한 대시보드 요약 시트가 있으면 읽어 둡니다. (유효성은 대시보드에서 확인)
+            if data_exporter.SUMMARY_SHEET in workbook.sheet_names:
+                meta = workbook.parse(data_exporter.SUMMARY_SHEET, dtype=str)
+                for key, value in zip(meta['key'], meta['value']):
+                    if key == summary.SUMMARY_ATTR:
+                        try:
+                            df.attrs[summary.SUMMARY_ATTR] = json.loads(value)
+                        except (TypeError, ValueError):
+                            pass
+    else:
+        compression = 'gzip' if name.endswith('.gz') else None
+        if PYARROW_AVAILABLE and compression is None:
+            df = pd.read_csv(buffer, engine='pyarrow', dtype=text_dtypes)
+        else:
+            df = pd.read_csv(buffer, compression=compression, dtype=text_dtypes, low_memory=False)
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def read_upload(uploaded_file) -> tuple:
+    """
+    업로드 파일의 (내용 해시, 데이터셋 지문, 데이터프레임)을 반환합니다.
+    같은 내용의 파일은 공용 데이터셋 저장소에 한 번만 파싱/보관되어, 어느 탭/세션에서 올려도
+    같은 데이터프레임 객체를 공유합니다. (공유 객체이므로 수정하지 말 것)
+    """
+    raw = uploaded_file.getvalue()
+    file_hash = content_hash(raw)
+    store = dataset_store.get_dataset_store()
+    fp = store.lookup_alias(file_hash)
+    if fp is not None:
+        df = store.get(fp)
+        if df is not None:
+            return file_hash, fp, df
+
+    with st.spinner("업로드 파일을 읽는 중..."):
+        df = parse_file(raw, uploaded_file.name)
+    fp = store.put(df, alias=file_hash)
+    return file_hash, fp, df
+
+
+def submit_upload(uploaded_file, uploader_key: str) -> bool:
+    """
+    업로드 파일을 읽어 main.py에 'UPLOAD_ACTION'을 등록합니다.
+    이 업로더에서 이미 처리한 파일이거나, 현재 분석 중인 것과 같은 내용이면 아무것도 하지 않고 False를 반환합니다.
+    """
+    if 'ingested_file_ids' not in st.session_state:
+        st.session_state.ingested_file_ids = {}
+    if 'ingested_content_hash' not in st.session_state:
+        st.session_state.ingested_content_hash = None
+
+    # 업로더마다 마지막으로 처리한 파일을 따로 기록해야, 다른 탭 업로더에 남아있는
+    # 예전 파일이 새 데이터를 덮어쓰는 일이 생기지 않습니다.
+    if st.session_state.ingested_file_ids.get(uploader_key) == uploaded_file.file_id:
+        return False
+
+    file_hash, fp, new_df = read_upload(uploaded_file)
+    st.session_state.ingested_file_ids[uploader_key] = uploaded_file.file_id
+    if file_hash == st.session_state.ingested_content_hash and st.session_state.get('data_type') == 'analysis':
+        return False
+
+    st.session_state.ingested_content_hash = file_hash
+    # 지문은 저장소에 등록할 때 이미 계산했으므로 함께 넘겨, main.py에서 전체 데이터를 다시 해싱하지 않게 합니다.
+    st.session_state.pending_action = ('UPLOAD_ACTION', (new_df, fp))
+    return True
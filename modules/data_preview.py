@@ -0,0 +1,56 @@
+# modules/data_preview.py
+import pandas as pd
+import streamlit as st
+from modules import profiler
+
+# 미리보기에 기본으로 보여줄 컬럼 (authorships, Abstract 같은 긴 컬럼은 사용자가 선택할 때만 표시)
+DEFAULT_COLUMNS = [
+    'id', 'doi', 'title', 'publication_year', 'Journal_Name',
+    'First_Author_Name', 'First_Author_Country', 'cited_by_count', 'fwci',
+]
+PAGE_SIZE_OPTIONS = [25, 50, 100, 200]
+MAX_CELL_CHARS = 120   # 이보다 긴 셀 문자열은 잘라서 보여줍니다.
+
+
+def truncate_cells(page: pd.DataFrame, max_chars: int = MAX_CELL_CHARS) -> pd.DataFrame:
+    """문자열 셀을 max_chars 글자로 자릅니다. (현재 페이지에만 적용)"""
+    page = page.copy()
+    for col in page.columns:
+        if page[col].dtype == object:
+            page[col] = page[col].map(lambda v: v[:max_chars] + '…' if isinstance(v, str) and len(v) > max_chars else v)
+    return page
+
+
+def get_page(df: pd.DataFrame, columns: list, page: int, page_size: int, max_chars: int = MAX_CELL_CHARS) -> pd.DataFrame:
+    """선택한 컬럼만 골라 한 페이지(page는 1부터 시작) 분량의 행을 잘라 반환합니다."""
+    start = (page - 1) * page_size
+    return truncate_cells(df.iloc[start:start + page_size][columns], max_chars)
+
+
+@st.fragment
+@profiler.traced
+def render_preview(df: pd.DataFrame, key: str, default_columns: list = None):
+    """
+    서버에서 페이지 단위로 잘라 보여주는 데이터 미리보기입니다.
+    브라우저로는 현재 페이지의 선택 컬럼(긴 셀은 잘라서)만 전송되므로, 데이터 크기와 관계없이 전송량이 일정합니다.
+    """
+    if df.empty:
+        st.info("표시할 데이터가 없습니다.")
+        return
+
+    default_columns = [col for col in (default_columns or DEFAULT_COLUMNS) if col in df.columns] or list(df.columns[:10])
+    columns = st.multiselect("표시할 컬럼", options=list(df.columns), default=default_columns, key=f"{key}_columns")
+    if not columns:
+        st.warning("표시할 컬럼을 하나 이상 선택해주세요.")
+        return
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        page_size = st.selectbox("페이지당 행 수", options=PAGE_SIZE_OPTIONS, index=1, key=f"{key}_page_size")
+    num_pages = max(1, -(-len(df) // page_size))
+    with col2:
+        page = st.number_input(f"페이지 (총 {num_pages:,}쪽)", min_value=1, max_value=num_pages, value=1, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    st.dataframe(get_page(df, columns, page, page_size), use_container_width=True)
+    st.caption(f"{len(df):,}건 중 {start + 1:,}–{min(start + page_size, len(df)):,}번째 행 (긴 텍스트는 {MAX_CELL_CHARS}자까지만 표시)")
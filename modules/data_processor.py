@@ -1,5 +1,10 @@
+import os
 import pandas as pd
 import json
+from modules import summary
+
+# 정제 엔진 선택: 'pandas'(기본) 또는 'polars' (polars 미설치 시 pandas로 실행)
+REFINE_ENGINE = os.environ.get("ALEXTEST_REFINE_ENGINE", "pandas").lower()
 
 # --- 1. 데이터 로딩 및 기본 준비 함수 ---
 def load_and_prepare_df(filepath: str) -> pd.DataFrame:
@@ -57,8 +62,10 @@ def refine_authors(df: pd.DataFrame) -> pd.DataFrame:
             all_institution_names, all_countries = set(), set()
 
             for author_info in authorships:
-                author_id = author_info.get('author', {}).get('id')
-                author_name = author_info.get('author', {}).get('display_name', '')
+                # author / display_name이 null인 레코드도 있으므로 빈 값으로 바꿔 둡니다.
+                author = author_info.get('author') or {}
+                author_id = author.get('id')
+                author_name = author.get('display_name') or ''
                 institutions = author_info.get('institutions', [])
                 countries = author_info.get('countries', []) # <--- 핵심 데이터
 
@@ -73,7 +80,7 @@ def refine_authors(df: pd.DataFrame) -> pd.DataFrame:
                     if countries: first_author_country = "; ".join(sorted(list(set(countries))))
 
                 if corr_ids and author_id in corr_ids:
-                    corr_author_names.append(author_name)
+                    if author_name: corr_author_names.append(author_name)
                     for inst_name in inst_names_str.split('; '): corr_institution_names.add(inst_name)
                     for country_code in countries: corr_author_countries.add(country_code) # <--- 로직 추가
 
@@ -187,11 +194,20 @@ def refine_country_info(df: pd.DataFrame) -> pd.DataFrame:
 # ==============================================================================
 # ★★★ 섹션 2: 모든 것을 총괄하는 '마스터' 함수 ★★★
 # ==============================================================================
-def process_and_refine_data(filepath: str) -> pd.DataFrame:
+def process_and_refine_data(filepath: str, engine: str = None) -> pd.DataFrame:
     """
     하나의 함수 호출로, 데이터 로딩부터 모든 정제 및 최종 정리까지
     전체 파이프라인을 실행합니다.
+    engine은 'pandas' 또는 'polars'이며, 지정하지 않으면 REFINE_ENGINE 설정을 따릅니다.
     """
+    engine = (engine or REFINE_ENGINE).lower()
+    if engine == 'polars':
+        from modules import polars_refine  # polars 엔진을 쓸 때만 불러옵니다.
+        if polars_refine.POLARS_AVAILABLE:
+            # 기본 동향 대시보드용 요약도 정제 단계에서 한 번만 계산해 둡니다.
+            return summary.attach_summary(polars_refine.process_and_refine_data(filepath))
+        print("경고: polars가 설치되어 있지 않아 pandas 엔진으로 정제합니다.")
+
     # 1. 데이터 로딩 및 준비
     df = load_and_prepare_df(filepath)
     if df.empty:
@@ -208,6 +224,9 @@ def process_and_refine_data(filepath: str) -> pd.DataFrame:
     # 3. 최종 정리 함수 호출
     final_df = finalize_dataframe(df)
 
+    # 4. 기본 동향 대시보드용 요약 계산 (내보내기 파일에 함께 저장되어, 업로드 시 다시 계산하지 않음)
+    final_df = summary.attach_summary(final_df)
+
     print("\n모든 데이터 처리 파이프라인이 성공적으로 완료되었습니다!")
     return final_df
 
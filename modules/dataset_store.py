@@ -0,0 +1,139 @@
+# modules/dataset_store.py
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+import streamlit as st
+from modules import fingerprint
+
+# 메모리에 올려둘 데이터셋 전체 크기의 상한 (MB, 환경변수로 조정 가능)
+MEMORY_BUDGET_MB = int(os.environ.get("ALEXTEST_DATASET_MEMORY_MB", "2048"))
+# 디스크로 내보낸 데이터셋 파일 전체 크기의 상한 (MB, 환경변수로 조정 가능)
+SPILL_BUDGET_MB = int(os.environ.get("ALEXTEST_DATASET_SPILL_MB", "4096"))
+SPILL_DIR = os.path.join("data", "spill")
+
+
+class DatasetStore:
+    """
+    프로세스 전체에서 공유하는 데이터셋 저장소입니다.
+    세션은 데이터프레임 대신 지문(fingerprint)만 들고 있고, 같은 데이터셋은 한 번만 보관합니다.
+    메모리 상한을 넘으면 가장 오래 사용하지 않은 데이터셋부터 디스크로 내보냅니다(spill).
+    디스크의 파일도 상한을 넘으면 가장 오래된 것부터 지우고, 다시 메모리로 읽어온 데이터셋의 파일은 바로 지웁니다.
+    """
+
+    def __init__(self, memory_budget_bytes: int, spill_dir: str, spill_budget_bytes: int):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = spill_dir
+        self.spill_budget_bytes = spill_budget_bytes
+        self._lock = threading.RLock()
+        self._hot = OrderedDict()   # 지문 -> 데이터프레임 (뒤쪽일수록 최근 사용)
+        self._sizes = {}            # 지문 -> 메모리 사용량(byte)
+        self._cold = OrderedDict()  # 지문 -> 디스크 파일 크기(byte) (뒤쪽일수록 최근에 내보냄)
+        self._aliases = {}          # 업로드 파일 내용 해시 등 -> 지문
+        self._clear_spill_dir()
+
+    # --- 1. 공개 API ---
+    def put(self, df: pd.DataFrame, fp: str = None, alias: str = None) -> str:
+        """데이터셋을 저장하고 지문을 반환합니다. 이미 같은 데이터셋이 있으면 기존 것을 재사용합니다."""
+        fp = fp or fingerprint.dataset_fingerprint(df)
+        with self._lock:
+            if alias:
+                self._aliases[alias] = fp
+            if fp in self._hot:
+                self._hot.move_to_end(fp)
+                return fp
+            # 디스크로 내보낸 같은 데이터셋이 있으면, 받은 데이터프레임을 메모리에 두고 파일은 지웁니다.
+            self._drop_cold(fp)
+            self._add_hot(fp, df)
+        return fp
+
+    def get(self, fp: str):
+        """지문에 해당하는 데이터셋을 반환합니다. 디스크로 내보낸 데이터셋은 다시 메모리로 읽어옵니다."""
+        with self._lock:
+            if fp in self._hot:
+                self._hot.move_to_end(fp)
+                return self._hot[fp]
+            if fp not in self._cold:
+                return None
+            print(f"-> 디스크에서 데이터셋 복원 중: {fp}")
+            df = pd.read_pickle(self._spill_path(fp))
+            self._drop_cold(fp)
+            self._add_hot(fp, df)
+            return df
+
+    def lookup_alias(self, alias: str):
+        """별칭(예: 업로드 파일 내용 해시)에 연결된 지문을 반환합니다. 없으면 None."""
+        with self._lock:
+            fp = self._aliases.get(alias)
+            if fp and (fp in self._hot or fp in self._cold):
+                return fp
+            return None
+
+    def stats(self) -> dict:
+        """저장소 현황(메모리 보관 수, 사용량, 상한)을 반환합니다."""
+        with self._lock:
+            return {
+                'hot_datasets': len(self._hot),
+                'memory_bytes': sum(self._sizes.values()),
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'spilled_datasets': len(self._cold),
+                'spill_bytes': sum(self._cold.values()),
+                'spill_budget_bytes': self.spill_budget_bytes,
+            }
+
+    # --- 2. 내부 함수 ---
+    def _spill_path(self, fp: str) -> str:
+        return os.path.join(self.spill_dir, f"{fp}.pkl")
+
+    def _add_hot(self, fp: str, df: pd.DataFrame):
+        self._hot[fp] = df
+        self._sizes[fp] = int(df.memory_usage(deep=True).sum())
+        self._evict_if_needed()
+
+    def _evict_if_needed(self):
+        # 방금 추가한 데이터셋 하나는 상한을 넘더라도 메모리에 남겨둡니다.
+        while len(self._hot) > 1 and sum(self._sizes.values()) > self.memory_budget_bytes:
+            fp, df = self._hot.popitem(last=False)
+            self._sizes.pop(fp, None)
+            path = self._spill_path(fp)
+            print(f"-> 메모리 상한 초과: 데이터셋을 디스크로 내보냅니다: {fp}")
+            os.makedirs(self.spill_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            self._cold[fp] = os.path.getsize(path)
+        # 디스크 상한을 넘으면 가장 오래전에 내보낸 데이터셋부터 지웁니다. (방금 내보낸 하나는 남김)
+        while len(self._cold) > 1 and sum(self._cold.values()) > self.spill_budget_bytes:
+            fp = next(iter(self._cold))
+            print(f"-> 디스크 상한 초과: 데이터셋을 삭제합니다: {fp}")
+            self._drop_cold(fp)
+
+    def _drop_cold(self, fp: str):
+        if self._cold.pop(fp, None) is not None:
+            try:
+                os.remove(self._spill_path(fp))
+            except FileNotFoundError:
+                pass
+
+    def _clear_spill_dir(self):
+        # 이전 실행에서 남은 파일은 참조하는 세션이 없으므로 시작할 때 지웁니다.
+        if not os.path.isdir(self.spill_dir):
+            return
+        for name in os.listdir(self.spill_dir):
+            if name.endswith('.pkl') or name.endswith('.tmp'):
+                os.remove(os.path.join(self.spill_dir, name))
+
+
+@st.cache_resource
+def get_dataset_store() -> DatasetStore:
+    """프로세스 전체에서 하나만 존재하는 데이터셋 저장소를 반환합니다."""
+    return DatasetStore(MEMORY_BUDGET_MB * 1024 * 1024, SPILL_DIR, SPILL_BUDGET_MB * 1024 * 1024)
+
+
+def get_session_dataset() -> pd.DataFrame:
+    """현재 세션이 참조하는 데이터셋을 반환합니다. 없으면 빈 데이터프레임을 반환합니다."""
+    fp = st.session_state.get('data_fingerprint')
+    if not fp:
+        return pd.DataFrame()
+    df = get_dataset_store().get(fp)
+    return df if df is not None else pd.DataFrame()
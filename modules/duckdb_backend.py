@@ -0,0 +1,198 @@
+# modules/duckdb_backend.py
+import os
+import threading
+import pandas as pd
+from modules import summary
+
+try:
+    import duckdb  # (선택) 내장형 컬럼 DB: 멀티코어 / 메모리 초과(out-of-core) SQL 집계에 사용
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+DB_DIR = os.path.join("data", "duckdb")
+MAX_DB_FILES = 8   # 디스크에 보관할 데이터셋(지문)별 DuckDB 파일 수 (LRU)
+_evict_lock = threading.Lock()
+# 'duckdb'로 지정하면 대시보드 집계를 DuckDB SQL로 실행합니다. (기본값: pandas)
+BACKEND = os.environ.get("ALEXTEST_ANALYSIS_BACKEND", "pandas").lower()
+
+# 논문 테이블(papers)에 싣는 컬럼: 대시보드 집계에 필요한 스칼라 컬럼만 사용합니다.
+PAPER_COLUMNS = [
+    'doi', 'publication_year', 'cited_by_count', 'fwci', 'Is_Top_10_Percent',
+    'First_Author_Name', 'First_Author_Institution', 'Primary_Topic(Score)',
+]
+NUMERIC_COLUMNS = {'publication_year', 'cited_by_count', 'fwci', 'Is_Top_10_Percent'}
+# 개체 테이블 이름 -> (원본 컬럼, 괄호 안 점수 제거 여부). 각 테이블은 (row_id, item) 쌍입니다.
+ENTITY_TABLES = {
+    'authors': ('All_Authors', False),
+    'corr_authors': ('Corresponding_Author_Names', False),
+    'institutions': ('All_Institutions', False),
+    'corr_institutions': ('Corresponding_Institution_Names', False),
+    'countries': ('All_Countries', False),
+    'first_author_countries': ('First_Author_Country', False),
+}
+
+
+def is_enabled() -> bool:
+    """DuckDB 백엔드를 사용할지 여부를 반환합니다. (환경변수로 선택, duckdb 미설치 시 항상 False)"""
+    return DUCKDB_AVAILABLE and BACKEND == 'duckdb'
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def build_database(df: pd.DataFrame, path: str):
+    """
+    정제된 데이터셋을 논문 테이블과 ';'로 펼친 개체 테이블로 DuckDB 파일에 저장합니다.
+    문자열 분리/펼치기도 DuckDB 안에서 병렬로 수행됩니다. (임시 파일에 쓴 뒤 교체)
+    """
+    source_columns = [col for col in PAPER_COLUMNS + [col for col, _ in ENTITY_TABLES.values()] if col in df.columns]
+    source = df[list(dict.fromkeys(source_columns))].reset_index(drop=True)
+    # 전체 데이터셋을 클리닝하지 않고, 싣는 컬럼만 공백/결측 표기 정리와 숫자 변환을 합니다.
+    for col in source.columns:
+        if col in NUMERIC_COLUMNS:
+            source[col] = pd.to_numeric(source[col], errors='coerce')
+        else:
+            source[col] = summary.text_values(source, col)
+    source.insert(0, 'row_id', range(len(source)))
+
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = duckdb.connect(tmp_path)
+    try:
+        con.register('source_df', source)
+        con.execute("CREATE TABLE source AS SELECT * FROM source_df")
+        paper_columns = ', '.join(['row_id'] + [quote(col) for col in PAPER_COLUMNS if col in source.columns])
+        con.execute(f"CREATE TABLE papers AS SELECT {paper_columns} FROM source")
+        for table, (col, strip_score) in ENTITY_TABLES.items():
+            if col not in source.columns:
+                continue
+            item = "trim(split_part(item, '(', 1))" if strip_score else "trim(item)"
+            # 한 논문 안에서 같은 항목이 중복 기록된 경우 한 번만 셉니다.
+            con.execute(f"""
+                CREATE TABLE {table} AS
+                SELECT DISTINCT row_id, {item} AS item
+                FROM (SELECT row_id, unnest(string_split({quote(col)}, ';')) AS item FROM source WHERE {quote(col)} IS NOT NULL)
+                WHERE {item} <> ''
+            """)
+        con.execute("DROP TABLE source")
+    finally:
+        con.close()
+    os.replace(tmp_path, path)
+
+
+class DuckDBBackend:
+    """데이터셋 하나의 DuckDB 파일 위에서 대시보드 집계를 SQL로 실행합니다. (읽기 전용, 스레드마다 별도 커서 사용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._con = duckdb.connect(path, read_only=True)
+        self.tables = {row[0] for row in self._con.execute("SHOW TABLES").fetchall()}
+        self.paper_columns = {row[0] for row in self._con.execute("DESCRIBE papers").fetchall()}
+
+    def query(self, sql: str, params: list = None) -> pd.DataFrame:
+        return self._con.cursor().execute(sql, params or []).df()
+
+    def scalar(self, sql: str, params: list = None):
+        return self._con.cursor().execute(sql, params or []).fetchone()[0]
+
+    def distinct_count(self, source: str):
+        """개체 테이블 또는 논문 컬럼의 고유값 개수를 반환합니다. (없으면 'N/A')"""
+        if source in ENTITY_TABLES:
+            return int(self.scalar(f"SELECT count(DISTINCT item) FROM {source}")) if source in self.tables else "N/A"
+        return int(self.scalar(f"SELECT count(DISTINCT {quote(source)}) FROM papers")) if source in self.paper_columns else 0
+
+    def column_mean(self, column: str) -> float:
+        """논문 컬럼의 평균값을 반환합니다. (없으면 NaN)"""
+        if column not in self.paper_columns:
+            return float('nan')
+        value = self.scalar(f"SELECT avg({quote(column)}) FROM papers")
+        return float('nan') if value is None else float(value)
+
+    def yearly_counts(self) -> pd.Series:
+        """연도별 논문 수를 반환합니다. (연도 오름차순)"""
+        if 'publication_year' not in self.paper_columns:
+            return pd.Series(dtype='int64')
+        result = self.query("""
+            SELECT CAST(publication_year AS INTEGER) AS publication_year, count(*) AS count
+            FROM papers WHERE publication_year IS NOT NULL GROUP BY 1 ORDER BY 1
+        """)
+        return result.set_index('publication_year')['count']
+
+    def top_entities(self, table: str, k: int = 15) -> pd.Series:
+        """개체 테이블에서 논문 수가 가장 많은 상위 k개 항목을 반환합니다. (많은 순)"""
+        if table not in self.tables:
+            return pd.Series(dtype='int64')
+        result = self.query(f"SELECT item, count(*) AS count FROM {table} GROUP BY item ORDER BY count DESC, item LIMIT {int(k)}")
+        return result.set_index('item')['count'].rename_axis(None)
+
+    def primary_topic_counts(self, k: int = 15) -> pd.Series:
+        """주요 토픽(점수 제외)별 논문 수 상위 k개를 반환합니다. (많은 순)"""
+        if 'Primary_Topic(Score)' not in self.paper_columns:
+            return pd.Series(dtype='int64')
+        result = self.query(f"""
+            SELECT trim(split_part("Primary_Topic(Score)", '(', 1)) AS item, count(*) AS count
+            FROM papers WHERE "Primary_Topic(Score)" IS NOT NULL GROUP BY item ORDER BY count DESC, item LIMIT {int(k)}
+        """)
+        return result.set_index('item')['count'].rename_axis(None)
+
+    def partner_stats(self, code: str) -> pd.DataFrame:
+        """대상국과 함께 참여한 협력국별 논문 수와 평균 FWCI를 반환합니다."""
+        if 'countries' not in self.tables:
+            return pd.DataFrame()
+        fwci = 'avg(p.fwci)' if 'fwci' in self.paper_columns else 'NULL'
+        return self.query(f"""
+            SELECT partner.item AS Partner_Country, count(*) AS Collaboration_Count, {fwci} AS Avg_FWCI
+            FROM countries target
+            JOIN countries partner ON partner.row_id = target.row_id AND partner.item <> target.item
+            JOIN papers p ON p.row_id = target.row_id
+            WHERE target.item = ?
+            GROUP BY partner.item ORDER BY partner.item
+        """, [code])
+
+    def close(self):
+        """연결을 닫습니다. (캐시에서 밀려날 때 호출)"""
+        self._con.close()
+
+
+def open_backend(data_fingerprint: str, df: pd.DataFrame) -> DuckDBBackend:
+    """데이터셋 버전(지문)별 DuckDB 파일을 (없으면 만들어서) 열어 반환합니다."""
+    os.makedirs(DB_DIR, exist_ok=True)
+    path = os.path.join(DB_DIR, f"{data_fingerprint}.duckdb")
+    if not os.path.exists(path):
+        build_database(df, path)
+    else:
+        os.utime(path)  # LRU: 최근 사용 시각 갱신
+    evict_old_databases(keep=path)
+    return DuckDBBackend(path)
+
+
+def release_backend(backend: DuckDBBackend):
+    """캐시에서 밀려난 백엔드의 연결을 닫고 DuckDB 파일을 지웁니다. (다시 필요하면 새로 만듦)"""
+    backend.close()
+    remove_database(backend.path)
+
+
+def remove_database(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass   # 이미 지워졌거나, 다른 연결이 아직 열고 있는 파일(Windows)은 다음 정리 때 지웁니다.
+
+
+def evict_old_databases(keep: str = None, max_entries: int = MAX_DB_FILES):
+    """DuckDB 파일이 max_entries개를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다. (keep과 만들다 만 임시 파일은 제외)"""
+    with _evict_lock:
+        if not os.path.isdir(DB_DIR):
+            return
+        paths = [os.path.join(DB_DIR, name) for name in os.listdir(DB_DIR) if name.endswith('.duckdb')]
+        paths = [path for path in paths if path != keep]
+        excess = len(paths) + (1 if keep else 0) - max_entries
+        if excess <= 0:
+            return
+        paths.sort(key=os.path.getmtime)
+        for old_path in paths[:excess]:
+            print(f"-> 오래된 DuckDB 파일 삭제: {old_path}")
+            remove_database(old_path)
@@ -0,0 +1,142 @@
+# modules/entity_index.py
+import json
+import numpy as np
+import pandas as pd
+
+OPENALEX_PREFIX = 'https://openalex.org/'
+
+# 개체 테이블 이름 -> 사용하는 코드북(같은 종류의 개체는 같은 정수 코드를 공유)
+TABLE_KINDS = {
+    'authors': 'author', 'first_authors': 'author', 'corr_authors': 'author',
+    'institutions': 'institution', 'first_institutions': 'institution', 'corr_institutions': 'institution',
+    'sources': 'source',
+}
+
+
+def short_id(openalex_id: str) -> str:
+    """'https://openalex.org/A123' -> 'A123' (메모리 절약용)"""
+    return openalex_id[len(OPENALEX_PREFIX):] if openalex_id.startswith(OPENALEX_PREFIX) else openalex_id
+
+
+def parse_json(value):
+    """정제/내보내기 과정에서 JSON 문자열로 바뀐 값과 원본(list/dict)을 모두 받아들입니다."""
+    if isinstance(value, (list, dict)):
+        return value
+    if isinstance(value, str) and value[:1] in '[{':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return None
+
+
+class Codebook:
+    """OpenAlex ID를 0부터 시작하는 조밀한 정수 코드로 바꾸고, 표시용 이름은 코드로만 찾습니다."""
+
+    def __init__(self):
+        self._codes = {}   # 짧은 ID -> 코드
+        self.ids = []      # 코드 -> 짧은 ID
+        self.names = []    # 코드 -> 처음 본 표시 이름
+
+    def intern(self, entity: dict):
+        """개체 사전({'id', 'display_name'})의 코드를 반환합니다. (ID가 없으면 None)"""
+        openalex_id = entity.get('id') if isinstance(entity, dict) else None
+        if not openalex_id:
+            return None
+        key = short_id(openalex_id)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.ids)
+            self.ids.append(key)
+            self.names.append(entity.get('display_name') or key)
+        return code
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class EntityTable:
+    """(논문 행 위치, 개체 코드) 쌍을 정수 배열로 담은 테이블입니다. 한 논문 안의 중복은 한 번만 기록합니다."""
+
+    def __init__(self, rows: list, codes: list, codebook: Codebook):
+        pairs = np.unique(np.column_stack([np.asarray(rows, dtype=np.int64), np.asarray(codes, dtype=np.int64)]), axis=0) \
+            if rows else np.empty((0, 2), dtype=np.int64)
+        self.rows = pairs[:, 0].astype(np.int32)
+        self.codes = pairs[:, 1].astype(np.int32)
+        self.codebook = codebook
+
+    def distinct_count(self) -> int:
+        return int(np.unique(self.codes).size)
+
+    def top(self, k: int = 15) -> pd.Series:
+        """논문 수 상위 k개 개체를 표시 이름 -> 논문 수로 반환합니다. (같으면 이름순, 이름이 겹치면 ID를 덧붙임)"""
+        counts = np.bincount(self.codes, minlength=len(self.codebook))
+        present = np.flatnonzero(counts)
+        names = [self.codebook.names[code] for code in present]
+        order = sorted(range(len(present)), key=lambda i: (-counts[present[i]], names[i]))[:k]
+        labels = [names[i] for i in order]
+        duplicated = {label for label in labels if labels.count(label) > 1}
+        labels = [f"{label} ({self.codebook.ids[present[i]]})" if label in duplicated else label for label, i in zip(labels, order)]
+        return pd.Series([int(counts[present[i]]) for i in order], index=labels, dtype='int64')
+
+
+class EntityIndex:
+    """저자/기관/저널(source) 개체 테이블 모음입니다. 고유 개수와 상위 목록은 모두 정수 코드로 계산합니다."""
+
+    def __init__(self, tables: dict, codebooks: dict):
+        self.tables = tables
+        self.codebooks = codebooks
+
+    def distinct_count(self, table: str):
+        return self.tables[table].distinct_count() if table in self.tables else None
+
+    def top(self, table: str, k: int = 15) -> pd.Series:
+        return self.tables[table].top(k) if table in self.tables else pd.Series(dtype='int64')
+
+
+def build_entity_index(df: pd.DataFrame):
+    """
+    정제 데이터에 함께 남아 있는 authorships / primary_location 원본(JSON)에서 OpenAlex ID 기준 개체 테이블을 만듭니다.
+    원본 컬럼이 없는 파일(예: 일부 컬럼만 내보낸 파일)이면 None을 반환하고, 호출하는 쪽은 이름 기준 집계를 사용합니다.
+    """
+    if 'authorships' not in df.columns:
+        return None
+    codebooks = {kind: Codebook() for kind in set(TABLE_KINDS.values())}
+    pairs = {table: ([], []) for table in TABLE_KINDS}
+
+    def add(table, row, code):
+        if code is not None:
+            pairs[table][0].append(row)
+            pairs[table][1].append(code)
+
+    corr_ids = df['corresponding_author_ids'] if 'corresponding_author_ids' in df.columns else pd.Series(None, index=df.index)
+    for row, (authorships, corr) in enumerate(zip(df['authorships'], corr_ids)):
+        authorships = parse_json(authorships)
+        if not isinstance(authorships, list):
+            continue
+        corr = set(parse_json(corr) or [])
+        for author_info in authorships:
+            if not isinstance(author_info, dict):
+                continue
+            author = author_info.get('author') or {}
+            author_code = codebooks['author'].intern(author)
+            is_first = author_info.get('author_position') == 'first'
+            is_corr = author.get('id') in corr
+            add('authors', row, author_code)
+            if is_first: add('first_authors', row, author_code)
+            if is_corr: add('corr_authors', row, author_code)
+            for inst in author_info.get('institutions') or []:
+                inst_code = codebooks['institution'].intern(inst)
+                add('institutions', row, inst_code)
+                if is_first: add('first_institutions', row, inst_code)
+                if is_corr: add('corr_institutions', row, inst_code)
+
+    if 'primary_location' in df.columns:
+        for row, location in enumerate(df['primary_location']):
+            location = parse_json(location)
+            if isinstance(location, dict):
+                add('sources', row, codebooks['source'].intern(location.get('source')))
+
+    tables = {table: EntityTable(rows, codes, codebooks[TABLE_KINDS[table]])
+              for table, (rows, codes) in pairs.items() if table != 'sources' or 'primary_location' in df.columns}
+    return EntityIndex(tables, codebooks)
@@ -0,0 +1,25 @@
+# modules/fingerprint.py
+import hashlib
+import pandas as pd
+
+def column_hashes(column: pd.Series) -> bytes:
+    """컬럼 하나의 행별 해시(uint64 배열)를 바이트로 반환합니다. 해싱할 수 없는 값(list/dict 등)은 문자열로 바꿔 해싱합니다."""
+    try:
+        hashes = pd.util.hash_pandas_object(column, index=False)
+    except TypeError:
+        hashes = pd.util.hash_pandas_object(column.astype(str), index=False)
+    return hashes.values.tobytes()
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    형태/컬럼과 모든 행의 값을 벡터 해싱해 데이터셋 지문(fingerprint)을 만듭니다.
+    같은 데이터셋이면 항상 같은 값을 돌려주고, 어느 한 셀이라도 바뀌면 다른 값이 됩니다.
+    (지문을 키로 쓰는 저장소/캐시/내보내기 파일이 수정된 데이터에 옛 결과를 돌려주지 않도록 표본이 아닌 전체를 해싱)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(df.shape).encode('utf-8'))
+    h.update("\x1f".join(map(str, df.columns)).encode('utf-8'))
+    for name in df.columns:
+        h.update(column_hashes(df[name]))
+    return h.hexdigest()
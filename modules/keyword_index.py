@@ -0,0 +1,108 @@
+# modules/keyword_index.py
+import numpy as np
+import pandas as pd
+
+KEYWORD_COL = 'Keywords(Scores)'
+COUNTRY_COL = 'First_Author_Country'
+
+
+def explode_entries(values: pd.Series, sep: str = ';', strip_score: bool = False) -> pd.DataFrame:
+    """
+    ';'로 구분된 문자열 컬럼을 (행 위치, 항목) 쌍으로 펼칩니다.
+    strip_score=True 이면 'memristor (0.812)' 처럼 괄호 앞의 이름만 남깁니다.
+    """
+    series = pd.Series(values.to_numpy(dtype=object), index=np.arange(len(values))).dropna()
+    series = series[series.map(lambda v: isinstance(v, str))]
+    items = series.str.split(sep).explode()
+    if strip_score:
+        items = items.str.split('(').str[0]
+    items = items.str.strip()
+    items = items[items.notna() & (items != '')]
+    entries = pd.DataFrame({'row': items.index.to_numpy(dtype=np.int64), 'item': items.to_numpy(dtype=object)})
+    # 한 논문 안에서 같은 항목이 중복 기록된 경우 한 번만 셉니다.
+    return entries.drop_duplicates()
+
+
+class KeywordIndex:
+    """
+    키워드 역색인(키워드 -> 논문 행 위치)과 키워드 x 연도 x (주저자)국가 빈도 큐브입니다.
+    키워드 정확 일치 검색, 전체/국가별 빈도와 연도별 추세를 모두 여기서 바로 읽습니다.
+    """
+
+    def __init__(self, keywords: list, offsets: np.ndarray, rows: np.ndarray,
+                 keyword_year: pd.Series, keyword_year_country: pd.Series, country_counts: pd.Series):
+        self.keywords = keywords                          # 키워드 번호 -> 키워드
+        self._offsets = offsets                           # 키워드 i의 행 위치: rows[offsets[i]:offsets[i+1]]
+        self._rows = rows
+        self._positions = {kw: i for i, kw in enumerate(keywords)}
+        self.keyword_year = keyword_year                  # (keyword, publication_year) -> 논문 수
+        self.keyword_year_country = keyword_year_country  # (country, keyword, publication_year) -> 논문 수
+        self.country_counts = country_counts              # 주저자 국가별 논문 수 (많은 순)
+        self.keyword_counts = keyword_year.groupby(level='keyword').sum().sort_values(ascending=False, kind='stable')
+
+    def __contains__(self, keyword) -> bool:
+        return keyword in self._positions
+
+    def rows(self, keyword: str) -> np.ndarray:
+        """키워드가 정확히 일치하는 논문의 행 위치를 반환합니다."""
+        i = self._positions.get(keyword)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        return self._rows[self._offsets[i]:self._offsets[i + 1]]
+
+    def postings(self) -> tuple:
+        """(행 위치, 키워드 번호) 쌍 전체를 반환합니다. 희소 행렬 구성에 사용합니다."""
+        keyword_ids = np.repeat(np.arange(len(self.keywords), dtype=np.int64), np.diff(self._offsets))
+        return self._rows, keyword_ids
+
+    def country_keyword_counts(self, country: str) -> pd.Series:
+        """주저자 국가가 해당 국가인 논문들의 키워드 빈도를 반환합니다. (많은 순)"""
+        if country not in self.keyword_year_country.index.get_level_values('country'):
+            return pd.Series(dtype='int64')
+        counts = self.keyword_year_country.xs(country, level='country').groupby(level='keyword').sum()
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def trend(self, keywords: list, country: str = None) -> pd.DataFrame:
+        """연도 x 키워드 빈도 표를 반환합니다. country를 주면 해당 주저자 국가 논문만 집계합니다."""
+        if country is None:
+            source = self.keyword_year
+        elif country in self.keyword_year_country.index.get_level_values('country'):
+            source = self.keyword_year_country.xs(country, level='country')
+        else:
+            source = pd.Series(dtype='int64', index=pd.MultiIndex.from_arrays([[], []], names=['keyword', 'publication_year']))
+        source = source[source.index.get_level_values('keyword').isin(keywords)]
+        source = source[source.index.get_level_values('publication_year').notna()]
+        table = source.unstack(level='keyword', fill_value=0).reindex(columns=keywords, fill_value=0)
+        table.index = table.index.astype(int)
+        table.index.name = 'publication_year'
+        return table.sort_index()
+
+
+def build_keyword_index(df: pd.DataFrame) -> KeywordIndex:
+    """Keywords(Scores) 컬럼을 한 번만 파싱하여 키워드 역색인과 빈도 큐브를 만듭니다."""
+    if KEYWORD_COL in df.columns:
+        keyword_entries = explode_entries(df[KEYWORD_COL], strip_score=True)
+    else:
+        keyword_entries = pd.DataFrame({'row': np.empty(0, dtype=np.int64), 'item': np.empty(0, dtype=object)})
+    years = pd.to_numeric(df['publication_year'], errors='coerce').to_numpy(dtype=float) if 'publication_year' in df.columns else np.full(len(df), np.nan)
+
+    # 1. 역색인 (키워드별 행 위치는 오름차순)
+    keyword_ids, keywords = pd.factorize(keyword_entries['item'], sort=True)
+    rows = keyword_entries['row'].to_numpy()
+    order = np.lexsort((rows, keyword_ids))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(keyword_ids, minlength=len(keywords)))])
+
+    # 2. 키워드 x 연도 빈도 (연도 결측 논문도 전체 빈도에는 포함)
+    postings = pd.DataFrame({'keyword': keyword_entries['item'].to_numpy(), 'publication_year': years[rows], 'row': rows})
+    keyword_year = postings.groupby(['keyword', 'publication_year'], dropna=False).size()
+
+    # 3. (주저자)국가 x 키워드 x 연도 빈도
+    if COUNTRY_COL in df.columns:
+        country_entries = explode_entries(df[COUNTRY_COL]).rename(columns={'item': 'country'})
+    else:
+        country_entries = pd.DataFrame({'row': np.empty(0, dtype=np.int64), 'country': np.empty(0, dtype=object)})
+    joined = postings.merge(country_entries, on='row')
+    keyword_year_country = joined.groupby(['country', 'keyword', 'publication_year'], dropna=False).size()
+    country_counts = country_entries['country'].value_counts()
+
+    return KeywordIndex(list(keywords), offsets, rows[order], keyword_year, keyword_year_country, country_counts)
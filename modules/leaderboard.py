@@ -0,0 +1,51 @@
+# modules/leaderboard.py
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from modules.keyword_index import KeywordIndex, explode_entries
+
+
+class KeywordLeaderboard:
+    """키워드 x 개체(연구기관 등) 논문 수 희소 행렬입니다. 키워드별 상위 개체를 행 조회 + top-k 선택으로 구합니다."""
+
+    def __init__(self, keywords: list, entities: list, matrix: sparse.csr_matrix):
+        self.entities = entities
+        self.matrix = matrix
+        self._positions = {kw: i for i, kw in enumerate(keywords)}
+
+    def top(self, keyword: str, k: int = 15) -> pd.Series:
+        """해당 키워드 논문이 가장 많은 상위 k개 개체와 논문 수를 반환합니다. (많은 순)"""
+        i = self._positions.get(keyword)
+        if i is None:
+            return pd.Series(dtype='int64')
+        start, end = self.matrix.indptr[i], self.matrix.indptr[i + 1]
+        columns, counts = self.matrix.indices[start:end], self.matrix.data[start:end]
+        if len(counts) > k:
+            selected = np.argpartition(-counts, k - 1)[:k]
+            columns, counts = columns[selected], counts[selected]
+        result = pd.Series(counts, index=[self.entities[c] for c in columns])
+        return result.sort_values(ascending=False, kind='stable')
+
+
+def build_keyword_leaderboard(keyword_idx: KeywordIndex, entity_values: pd.Series) -> KeywordLeaderboard:
+    """
+    논문 x 키워드(K), 논문 x 개체(E) 희소 발생 행렬을 만든 뒤,
+    K^T E 한 번으로 모든 키워드의 개체별 논문 수를 계산합니다.
+    entity_values는 ';'로 구분된 개체 이름 컬럼입니다. (예: All_Institutions)
+    """
+    n_rows = len(entity_values)
+    keyword_rows, keyword_ids = keyword_idx.postings()
+    keyword_matrix = sparse.csr_matrix(
+        (np.ones(len(keyword_rows), dtype=np.int32), (keyword_rows, keyword_ids)),
+        shape=(n_rows, len(keyword_idx.keywords)),
+    )
+
+    entries = explode_entries(entity_values)
+    entity_ids, entities = pd.factorize(entries['item'])
+    entity_matrix = sparse.csr_matrix(
+        (np.ones(len(entries), dtype=np.int32), (entries['row'].to_numpy(), entity_ids)),
+        shape=(n_rows, len(entities)),
+    )
+
+    matrix = (keyword_matrix.T @ entity_matrix).tocsr()
+    return KeywordLeaderboard(keyword_idx.keywords, list(entities), matrix)
@@ -0,0 +1,216 @@
+# modules/polars_refine.py
+import json
+import sys
+import pandas as pd
+
+try:
+    import polars as pl  # (선택) 멀티스레드 / 지연(lazy) 실행 컬럼 엔진
+    import pyarrow  # noqa: F401  (polars -> pandas 변환에 사용)
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# 정제에 필요한 필드만 담은 중첩 스키마. JSON 문자열은 이 스키마로만 디코딩하므로 나머지 필드는 읽지 않습니다.
+if POLARS_AVAILABLE:
+    ITEM_DTYPE = pl.Struct({'display_name': pl.String, 'score': pl.Float64})
+    AUTHORSHIPS_DTYPE = pl.List(pl.Struct({
+        'author_position': pl.String,
+        'author': pl.Struct({'id': pl.String, 'display_name': pl.String}),
+        'institutions': pl.List(pl.Struct({'display_name': pl.String})),
+        'countries': pl.List(pl.String),
+    }))
+    PERCENTILE_DTYPE = pl.Struct({'value': pl.Float64, 'is_in_top_1_percent': pl.Boolean, 'is_in_top_10_percent': pl.Boolean})
+    LOCATION_DTYPE = pl.Struct({'source': pl.Struct({'display_name': pl.String, 'host_organization_name': pl.String, 'issn_l': pl.String})})
+
+# 정제 단계에서 추가되는 컬럼 (pandas 경로와 같은 순서)
+AUTHOR_COLUMNS = [
+    'First_Author_Name', 'First_Author_Institution', 'First_Author_Country',
+    'Corresponding_Author_Names', 'Corresponding_Institution_Names', 'Corresponding_Author_Countries',
+    'All_Authors', 'All_Institutions', 'All_Countries',
+]
+
+
+# --- 1. 데이터 로딩: 중첩 컬럼은 JSON 문자열로 읽습니다 ---
+def nested_columns(filepath: str) -> list:
+    """JSONL의 중첩(객체/배열) 컬럼 이름 목록을 반환합니다."""
+    # abstract_inverted_index는 단어마다 필드가 생기므로 스키마 추론에서 제외합니다.
+    schema = pl.scan_ndjson(filepath, infer_schema_length=None, schema_overrides={'abstract_inverted_index': pl.String}).collect_schema()
+    return [col for col, dtype in schema.items() if dtype.is_nested() or col == 'abstract_inverted_index']
+
+
+def scan_jsonl(filepath: str, nested: list) -> "pl.LazyFrame":
+    """
+    JSONL 파일을 지연(lazy) 프레임으로 엽니다. 중첩 컬럼은 원본 JSON 문자열로 읽어 두고,
+    정제에 필요한 필드만 명시적 스키마로 디코딩합니다.
+    원본 중첩 컬럼은 파일의 JSON 텍스트 그대로 내보냅니다. (pandas 경로의 json.dumps 표기와 공백/숫자 표기만 다르고 내용은 같음)
+    """
+    return pl.scan_ndjson(filepath, infer_schema_length=None, schema_overrides={col: pl.String for col in nested})
+
+
+# --- 2. 정제 표현식 ---
+def format_item_expr(item: "pl.Expr") -> "pl.Expr":
+    """{'display_name', 'score'} 항목을 'name (score)' 문자열로 만듭니다. (점수는 소수 셋째 자리 반올림)"""
+    score = item.struct.field('score')
+    score_text = pl.when(score.is_null()).then(pl.lit('0')).otherwise(score.round(3).cast(pl.String))
+    return pl.format("{} ({})", item.struct.field('display_name').fill_null('N/A'), score_text)
+
+
+def author_columns(lf: "pl.LazyFrame") -> "pl.LazyFrame":
+    """authorships를 (논문, 저자) 행으로 펼친 뒤 논문별로 다시 모아 저자/기관/국가 컬럼을 만듭니다."""
+    authors = (
+        lf.select(
+            '_row',
+            pl.col('authorships').str.json_decode(AUTHORSHIPS_DTYPE),
+            pl.col('corresponding_author_ids').str.json_decode(pl.List(pl.String)).alias('_corr_ids')
+            if 'corresponding_author_ids' in lf.collect_schema() else pl.lit(None, dtype=pl.List(pl.String)).alias('_corr_ids'),
+        )
+        .explode('authorships')
+        .select(
+            '_row',
+            pl.col('authorships').struct.field('author_position').alias('position'),
+            pl.col('authorships').struct.field('author').struct.field('id').alias('author_id'),
+            pl.col('authorships').struct.field('author').struct.field('display_name').alias('author_name'),
+            # 저자별 소속기관 문자열: 이름이 있는 기관만 정렬하여 '; '로 연결 (기관이 없으면 '')
+            pl.col('authorships').struct.field('institutions')
+              .list.eval(pl.element().struct.field('display_name').filter(pl.element().struct.field('display_name').fill_null('') != ''))
+              .list.sort().list.join('; ').fill_null('').alias('inst_str'),
+            pl.col('authorships').struct.field('countries').alias('countries'),
+            pl.col('_corr_ids'),
+            pl.col('authorships').is_not_null().alias('is_author'),
+        )
+        .with_columns(
+            (pl.col('position') == 'first').fill_null(False).alias('is_first'),
+            pl.col('_corr_ids').list.contains(pl.col('author_id')).fill_null(False).alias('is_corr'),
+            pl.col('inst_str').str.split('; ').alias('inst_names'),
+        )
+    )
+
+    def joined_set(values: "pl.Expr") -> "pl.Expr":
+        return values.explode().drop_nulls().unique().sort().str.join('; ')
+
+    return authors.group_by('_row').agg(
+        pl.col('author_name').filter(pl.col('is_first')).last().fill_null('').alias('First_Author_Name'),
+        pl.col('inst_str').filter(pl.col('is_first')).last().fill_null('').alias('First_Author_Institution'),
+        joined_set(pl.col('countries').filter(pl.col('is_first'))).alias('First_Author_Country'),
+        pl.col('author_name').filter(pl.col('is_corr') & (pl.col('author_name').fill_null('') != '')).sort().str.join('; ').alias('Corresponding_Author_Names'),
+        joined_set(pl.col('inst_names').filter(pl.col('is_corr'))).alias('Corresponding_Institution_Names'),
+        joined_set(pl.col('countries').filter(pl.col('is_corr'))).alias('Corresponding_Author_Countries'),
+        pl.col('author_name').filter(pl.col('author_name').fill_null('') != '').str.join('; ').alias('All_Authors'),
+        joined_set(pl.col('inst_names').filter(pl.col('is_author'))).alias('All_Institutions'),
+        joined_set(pl.col('countries')).alias('All_Countries'),
+    )
+
+
+def reconstruct_abstract(text: str) -> str:
+    """abstract_inverted_index(JSON 문자열)를 단어 위치 순서대로 복원합니다."""
+    try:
+        inverted_index = json.loads(text)
+        if not isinstance(inverted_index, dict): return ""
+        indexed_words = sorted([(idx, word) for word, indices in inverted_index.items() for idx in indices])
+        return " ".join([word for idx, word in indexed_words])
+    except Exception: return ""
+
+
+def refined_columns(schema) -> list:
+    """주제/키워드/초록/인용 백분위/저널 컬럼을 만드는 표현식 목록을 반환합니다."""
+    def decoded(col, dtype):
+        return pl.col(col).str.json_decode(dtype) if col in schema else pl.lit(None, dtype=dtype)
+
+    topics = decoded('topics', pl.List(ITEM_DTYPE))
+    keywords = decoded('keywords', pl.List(ITEM_DTYPE))
+    percentile = decoded('citation_normalized_percentile', PERCENTILE_DTYPE)
+    source = decoded('primary_location', LOCATION_DTYPE).struct.field('source')
+    abstract = pl.col('abstract_inverted_index') if 'abstract_inverted_index' in schema else pl.lit(None, dtype=pl.String)
+    return [
+        pl.when(decoded('primary_topic', ITEM_DTYPE).is_not_null()).then(format_item_expr(decoded('primary_topic', ITEM_DTYPE))).otherwise(pl.lit('')).alias('Primary_Topic(Score)'),
+        topics.list.eval(format_item_expr(pl.element())).list.join('; ').fill_null('').alias('Top_Topics(Scores)'),
+        # 키워드는 점수 내림차순(동점은 원래 순서 유지)으로 정렬합니다.
+        keywords.list.eval(format_item_expr(pl.element().sort_by(pl.element().struct.field('score').fill_null(0), descending=True, maintain_order=True)))
+                .list.join('; ').fill_null('').alias('Keywords(Scores)'),
+        # 초록 복원만은 단어 위치 정렬이 필요한 가변 구조라 Python 함수로 처리합니다.
+        abstract.map_elements(reconstruct_abstract, return_dtype=pl.String, skip_nulls=True).fill_null('').alias('Abstract'),
+        percentile.struct.field('value').alias('Citation_Percentile'),
+        percentile.struct.field('is_in_top_1_percent').alias('Is_Top_1_Percent'),
+        percentile.struct.field('is_in_top_10_percent').alias('Is_Top_10_Percent'),
+        source.struct.field('display_name').alias('Journal_Name'),
+        source.struct.field('host_organization_name').alias('Publisher'),
+        source.struct.field('issn_l').alias('ISSN-L'),
+    ]
+
+
+# --- 3. 전체 파이프라인 ---
+def refine_lazy(filepath: str, nested: list) -> "pl.LazyFrame":
+    """로딩, 중복 제거, 모든 정제 컬럼 계산을 하나의 지연 실행 계획으로 만듭니다."""
+    lf = scan_jsonl(filepath, nested)
+    schema = lf.collect_schema()
+    if 'id' in schema:
+        lf = lf.unique(subset=['id'], keep='first', maintain_order=True)
+    lf = lf.with_row_index('_row')
+
+    if 'authorships' in schema:
+        lf = lf.join(author_columns(lf), on='_row', how='left').with_columns(pl.col(AUTHOR_COLUMNS).fill_null(''))
+    else:
+        lf = lf.with_columns([pl.lit('').alias(col) for col in AUTHOR_COLUMNS])
+    return lf.with_columns(refined_columns(schema)).sort('_row').drop('_row')
+
+
+def process_and_refine_data(filepath: str) -> pd.DataFrame:
+    """polars 엔진으로 JSONL을 정제하여 pandas 경로(finalize_dataframe)와 같은 컬럼의 데이터프레임을 반환합니다."""
+    from modules import data_processor
+    print("Step 1: 데이터 로딩 및 정제 (polars 엔진)...")
+    try:
+        nested = nested_columns(filepath)
+        refined = refine_lazy(filepath, nested).collect()
+    except FileNotFoundError:
+        print(f"에러: '{filepath}' 파일을 찾을 수 없습니다.")
+        return pd.DataFrame()
+    except pl.exceptions.ComputeError as e:
+        print(f"경고: 파일에서 데이터를 읽어오지 못했습니다: {e}")
+        return pd.DataFrame()
+    if refined.height == 0:
+        print("경고: 파일에서 데이터를 읽어오지 못했습니다.")
+        return pd.DataFrame()
+    print(f"-> 정제 완료 데이터: {refined.height} 행")
+    return data_processor.finalize_dataframe(refined.to_pandas())
+
+
+# --- 4. pandas 경로와의 결과 비교 ---
+def same_value(a, b, is_json: bool = False) -> bool:
+    """두 셀 값이 같은지 비교합니다. 원본 중첩 컬럼(is_json)은 JSON 표기 차이를 무시하도록 디코딩한 값으로 비교합니다."""
+    if is_json and isinstance(a, str) and isinstance(b, str):
+        return json.loads(a) == json.loads(b)
+    return a == b or (a is None and b is None)
+
+
+def check_parity(filepath: str) -> list:
+    """
+    같은 JSONL을 pandas 엔진과 polars 엔진으로 정제한 뒤 컬럼별로 비교합니다. (tests/test_polars_parity.py에서 실행)
+    값이 다른 컬럼(또는 컬럼 구성 차이)의 설명 목록을 반환합니다. (빈 목록이면 동일)
+    """
+    from modules import data_processor
+    expected = data_processor.process_and_refine_data(filepath, engine='pandas').reset_index(drop=True)
+    actual = process_and_refine_data(filepath).reset_index(drop=True)
+
+    if list(expected.columns) != list(actual.columns):
+        return [f"컬럼 구성이 다릅니다: pandas={list(expected.columns)}, polars={list(actual.columns)}"]
+    if len(expected) != len(actual):
+        return [f"행 수가 다릅니다: pandas={len(expected)}, polars={len(actual)}"]
+
+    nested = set(nested_columns(filepath))
+    mismatches = []
+    for col in expected.columns:
+        left = expected[col].astype(object).where(expected[col].notna(), None)
+        right = actual[col].astype(object).where(actual[col].notna(), None)
+        differs = [i for i, (a, b) in enumerate(zip(left, right)) if not same_value(a, b, col in nested)]
+        if differs:
+            mismatches.append(f"{col}: {len(differs)}개 행이 다릅니다 (첫 행: {differs[0]})")
+    return mismatches
+
+
+if __name__ == '__main__':
+    # 사용법: python -m modules.polars_refine data/jobs/<작업 ID>.jsonl
+    if len(sys.argv) < 2:
+        sys.exit("사용법: python -m modules.polars_refine <JSONL 파일 경로>")
+    problems = check_parity(sys.argv[1])
+    print("\n".join(problems) if problems else "pandas / polars 정제 결과가 동일합니다.")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,232 @@
+# modules/profiler.py
+import functools
+import importlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import ContextDecorator, contextmanager
+from datetime import datetime
+
+# '1'이면 화면 모듈별 import / 첫 렌더링 시간을 사이드바에 표시합니다. (콘솔 출력은 항상)
+PROFILE_STARTUP = os.environ.get("ALEXTEST_PROFILE_STARTUP", "0") == "1"
+
+# '1'이면 재실행마다 렌더링 구간별 시간/호출 수를 기록해 TRACE_FILE(JSONL)에 추가합니다.
+TRACE_RENDER = os.environ.get("ALEXTEST_TRACE_RENDER", "0") == "1"
+# '1'이면 직전 재실행의 구간별 기록을 사이드바 개발자 오버레이로 표시합니다. (기록도 함께 켜짐)
+TRACE_OVERLAY = os.environ.get("ALEXTEST_TRACE_OVERLAY", "0") == "1"
+TRACE_FILE = os.environ.get("ALEXTEST_TRACE_FILE", os.path.join("data", "traces", "render_trace.jsonl"))
+
+# 프로세스 전체에서 공유하는 기록: 모듈 이름 -> {'import_ms', 'first_render_ms'}
+_records = {}
+_lock = threading.Lock()
+PROCESS_START = time.perf_counter()
+
+
+def import_view(module_name: str):
+    """화면 모듈을 처음 필요할 때 import 하고, 프로세스에서 처음 import 할 때 걸린 시간을 기록합니다."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _lock:
+        _records.setdefault(module_name, {})['import_ms'] = elapsed_ms
+    print(f"-> [startup] {module_name} import: {elapsed_ms:.0f} ms")
+    return module
+
+
+@contextmanager
+def first_render(module_name: str):
+    """감싼 블록이 이 프로세스에서 해당 모듈의 첫 렌더링이면 걸린 시간을 기록합니다."""
+    with _lock:
+        already_recorded = 'first_render_ms' in _records.get(module_name, {})
+    if already_recorded:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with _lock:
+            _records.setdefault(module_name, {}).setdefault('first_render_ms', elapsed_ms)
+        print(f"-> [startup] {module_name} 첫 렌더링: {elapsed_ms:.0f} ms")
+
+
+def report() -> list:
+    """[{'module', 'import_ms', 'first_render_ms'}, ...] 형식의 현재 기록을 반환합니다."""
+    with _lock:
+        return [{'module': name, 'import_ms': rec.get('import_ms'), 'first_render_ms': rec.get('first_render_ms')}
+                for name, rec in _records.items()]
+
+
+def render_report():
+    """시작 프로파일을 사이드바에 표시합니다. (ALEXTEST_PROFILE_STARTUP=1 인 경우에만)"""
+    if not PROFILE_STARTUP:
+        return
+    import streamlit as st
+    with st.sidebar.expander("⏱️ 시작 프로파일 (ms)", expanded=False):
+        st.caption(f"프로세스 시작 후 {(time.perf_counter() - PROCESS_START):.1f}초 경과")
+        st.dataframe(report(), hide_index=True, use_container_width=True)
+
+
+# --- 렌더링 구간 계측: 재실행(rerun) 단위로 구간별 시간과 호출 수를 모읍니다 ---
+# 재실행은 세션별 스크립트 스레드에서 실행되므로, 진행 중인 기록은 스레드마다 따로 둡니다.
+_current = threading.local()
+_trace_file_lock = threading.Lock()
+
+
+def tracing_enabled() -> bool:
+    return TRACE_RENDER or TRACE_OVERLAY
+
+
+class span(ContextDecorator):
+    """
+    감싼 구간(with 블록 또는 함수)의 실행 시간과 호출 수를 현재 재실행 기록에 더합니다.
+    진행 중인 재실행 기록이 없으면(예: fragment만 다시 실행된 경우) 이 구간 하나를 기록으로 남깁니다.
+    계측이 꺼져 있으면 아무 것도 하지 않습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if not tracing_enabled():
+            return self
+        self._owns_run = getattr(_current, 'run', None) is None
+        if self._owns_run:
+            _begin_run('fragment', self.name)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not tracing_enabled() or not hasattr(self, '_start'):
+            return False
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        run = getattr(_current, 'run', None)
+        if run is not None:
+            stats = run['spans'].setdefault(self.name, {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        if self._owns_run:
+            _end_run(interrupted=exc_type is not None)
+        return False
+
+
+def traced(func):
+    """함수 전체를 '모듈.함수이름' 구간으로 계측하는 데코레이터입니다. (@st.fragment 아래에 붙임)"""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _begin_run(kind: str, view: str):
+    _current.run = {'kind': kind, 'view': view, 'started': time.perf_counter(), 'spans': {}}
+
+
+def _end_run(interrupted: bool) -> dict:
+    run, _current.run = _current.run, None
+    record = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'kind': run['kind'],
+        'view': run['view'],
+        'total_ms': round((time.perf_counter() - run['started']) * 1000, 2),
+        # st.rerun() 등으로 도중에 끝난 재실행
+        'interrupted': interrupted,
+        'spans': {name: {'calls': stats['calls'], 'total_ms': round(stats['total_ms'], 2), 'max_ms': round(stats['max_ms'], 2)}
+                  for name, stats in run['spans'].items()},
+    }
+    append_trace(record)
+    return record
+
+
+def append_trace(record: dict, path: str = None):
+    """계측 기록 한 줄을 JSONL 파일에 추가합니다. (여러 세션이 동시에 써도 줄이 섞이지 않도록 잠금 사용)"""
+    path = path or TRACE_FILE
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with _trace_file_lock, open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+@contextmanager
+def render_run(view: str):
+    """
+    앱 전체 재실행 한 번을 계측합니다. 블록 안의 span/traced 구간이 이 기록에 모이고,
+    끝나면 TRACE_FILE에 한 줄로 추가되며, 오버레이가 켜져 있으면 사이드바에 표시됩니다.
+    """
+    if not tracing_enabled():
+        yield
+        return
+    _begin_run('rerun', view)
+    try:
+        yield
+    except BaseException:
+        # st.rerun()/st.stop()도 예외로 전달되므로, 기록만 남기고 그대로 다시 발생시킵니다.
+        _end_run(interrupted=True)
+        raise
+    record = _end_run(interrupted=False)
+    if TRACE_OVERLAY:
+        render_trace_overlay(record)
+
+
+def render_trace_overlay(record: dict):
+    """직전 재실행의 구간별 시간/호출 수를 사이드바에 표시합니다. (느린 구간 순)"""
+    import streamlit as st
+    rows = sorted(({'구간': name, '호출 수': stats['calls'], '합계(ms)': stats['total_ms'], '최대(ms)': stats['max_ms']}
+                   for name, stats in record['spans'].items()), key=lambda row: -row['합계(ms)'])
+    with st.sidebar.expander(f"🐢 렌더링 계측: {record['total_ms']:,.0f} ms", expanded=True):
+        st.caption(f"{record['view']} · {record['ts']}")
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+# --- 명령줄 도구: 새 프로세스에서 모듈별 import 비용을 측정 ---
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module_name: str, top_n: int = 10) -> tuple:
+    """
+    새 파이썬 프로세스에서 `-X importtime`으로 모듈을 import 하여
+    (전체 import 시간 ms, 누적 시간이 큰 직접 의존성 [(이름, ms), ...])를 반환합니다.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"{module_name} import 실패")
+    entries = []   # (이름, 깊이, 누적 ms)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            entries.append((match.group(4), len(match.group(3)) // 2, int(match.group(2)) / 1000))
+    target = next((i for i in range(len(entries) - 1, -1, -1) if entries[i][0] == module_name), None)
+    if target is None:
+        return 0.0, []
+    # 출력은 하위 모듈이 먼저 나오는 후위 순서이므로, 대상 줄 바로 앞에서 더 깊은 줄들만 대상 모듈의 의존성입니다.
+    # (인터프리터 시작 시 불러오는 encodings/site 등의 모듈은 이 구간 밖에 있어 제외됨)
+    _, target_depth, total_ms = entries[target]
+    children = []
+    for name, depth, cumulative_ms in reversed(entries[:target]):
+        if depth <= target_depth:
+            break
+        if depth == target_depth + 1:
+            children.append((name, cumulative_ms))
+    return total_ms, sorted(children, key=lambda item: -item[1])[:top_n]
+
+
+if __name__ == '__main__':
+    # 사용법: python -m modules.profiler [모듈 이름 ...]  (기본값: 모든 화면 모듈)
+    targets = sys.argv[1:] or ['tab_search', 'tab_basic_dashboard', 'tab_country_deepdive', 'tab_deep_dashboard']
+    for target in targets:
+        total, heaviest = measure_import(target)
+        print(f"{target}: {total:,.0f} ms")
+        for name, ms in heaviest:
+            print(f"    {name:<40} {ms:>8,.0f} ms")
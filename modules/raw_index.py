@@ -0,0 +1,130 @@
+# modules/raw_index.py
+import json
+import mmap
+import os
+import numpy as np
+
+# 사이드카 색인 파일: 원본 JSONL 한 줄마다 (논문 번호, 바이트 위치, 바이트 길이) 고정 길이 레코드 하나
+INDEX_SUFFIX = '.idx'
+INDEX_DTYPE = np.dtype([('work', '<i8'), ('offset', '<u8'), ('length', '<u4')])
+OPENALEX_WORK_PREFIX = 'https://openalex.org/W'
+
+
+def sidecar_path(raw_path: str) -> str:
+    return raw_path + INDEX_SUFFIX
+
+
+def work_number(work_id) -> int:
+    """'https://openalex.org/W123', 'W123', 123 -> 123 (알 수 없는 형식이면 -1)"""
+    if isinstance(work_id, (int, np.integer)):
+        return int(work_id)
+    text = str(work_id).strip()
+    if text.startswith(OPENALEX_WORK_PREFIX):
+        text = text[len(OPENALEX_WORK_PREFIX):]
+    elif text[:1] in ('W', 'w'):
+        text = text[1:]
+    return int(text) if text.isdigit() else -1
+
+
+def encode_line(work: dict) -> bytes:
+    """레코드 하나를 JSONL 한 줄(UTF-8 바이트)로 만듭니다. 바이너리 모드로 쓰므로 OS와 무관하게 줄바꿈은 항상 '\\n'입니다."""
+    return (json.dumps(work, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class IndexWriter:
+    """원본 JSONL을 바이너리 모드로 쓰면서, 같은 순서로 사이드카 색인을 함께 기록합니다. (data_fetcher.harvest에서 사용)"""
+
+    def __init__(self, raw_file, index_path: str):
+        self._raw = raw_file
+        self._index = open(index_path, 'wb')
+        self._offset = raw_file.tell()
+
+    def write_page(self, works: list):
+        records = np.empty(len(works), dtype=INDEX_DTYPE)
+        for i, work in enumerate(works):
+            line = encode_line(work)
+            self._raw.write(line)
+            records[i] = (work_number(work.get('id', '')), self._offset, len(line))
+            self._offset += len(line)
+        records.tofile(self._index)
+        self._index.flush()
+
+    def close(self):
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def build_index(raw_path: str) -> str:
+    """사이드카 색인이 없는 기존 JSONL을 한 번 훑어 색인을 만듭니다. (색인 파일 경로 반환)"""
+    index_path = sidecar_path(raw_path)
+    records, offset = [], 0
+    with open(raw_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                work_id = json.loads(line).get('id', '')
+                records.append((work_number(work_id), offset, len(line)))
+            offset += len(line)
+    tmp_path = f"{index_path}.tmp"
+    np.array(records, dtype=INDEX_DTYPE).tofile(tmp_path)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+class RawIndex:
+    """
+    원본 JSONL과 사이드카 색인으로 논문 ID별 원본 레코드를 파일 전체를 다시 읽지 않고 바로 찾습니다.
+    원본 파일은 메모리 매핑(mmap)으로 열어 필요한 바이트 구간만 읽습니다.
+    """
+
+    def __init__(self, raw_path: str):
+        self.raw_path = raw_path
+        index_path = sidecar_path(raw_path)
+        if not os.path.exists(index_path):
+            build_index(raw_path)
+        self.entries = np.fromfile(index_path, dtype=INDEX_DTYPE)
+        # 같은 논문이 여러 페이지에 중복 수집된 경우 처음 기록된 줄을 사용합니다.
+        works = self.entries['work']
+        self._positions = {int(work): pos for pos, work in reversed(list(enumerate(works)))}
+        self._file = open(raw_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(raw_path) else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, work_id) -> bool:
+        return work_number(work_id) in self._positions
+
+    def raw_bytes(self, work_id):
+        """논문 하나의 원본 JSON 바이트를 반환합니다. (없으면 None)"""
+        pos = self._positions.get(work_number(work_id))
+        if pos is None or self._mmap is None:
+            return None
+        entry = self.entries[pos]
+        return self._mmap[int(entry['offset']):int(entry['offset']) + int(entry['length'])]
+
+    def get(self, work_id):
+        """논문 하나의 원본 레코드(dict)를 반환합니다. (없으면 None)"""
+        raw = self.raw_bytes(work_id)
+        return json.loads(raw) if raw is not None else None
+
+    def get_many(self, work_ids: list) -> list:
+        """여러 논문의 원본 레코드를 입력 순서대로 반환합니다. 읽기는 파일 위치 순으로 정렬해 수행합니다. (없는 ID는 None)"""
+        positions = [self._positions.get(work_number(work_id)) for work_id in work_ids]
+        found = sorted({pos for pos in positions if pos is not None}, key=lambda pos: self.entries[pos]['offset'])
+        records = {}
+        for pos in found:
+            entry = self.entries[pos]
+            records[pos] = json.loads(self._mmap[int(entry['offset']):int(entry['offset']) + int(entry['length'])])
+        return [records.get(pos) if pos is not None else None for pos in positions]
+
+    def close(self):
+        """메모리 매핑과 파일을 닫습니다. (캐시에서 밀려나거나 원본 파일을 지우기 전에 호출)"""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
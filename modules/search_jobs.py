@@ -0,0 +1,181 @@
+# modules/search_jobs.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import streamlit as st
+from modules import url_builder, data_fetcher, data_processor, data_exporter, dataset_store, fingerprint, streaming_sketch, raw_index
+
+JOB_DIR = os.path.join("data", "jobs")
+# 동시에 실행할 검색 작업 수 (나머지는 대기열에서 순서대로 실행, 환경변수로 조정 가능)
+MAX_WORKERS = int(os.environ.get("ALEXTEST_SEARCH_WORKERS", "2"))
+MAX_JOBS = 50   # 보관할 작업 기록 수 (오래된 완료 작업부터 정리)
+
+# 작업 상태
+QUEUED, COLLECTING, PROCESSING, DONE, FAILED, CANCELLED = 'queued', 'collecting', 'processing', 'done', 'failed', 'cancelled'
+ACTIVE_STATES = (QUEUED, COLLECTING, PROCESSING)
+STATE_LABELS = {
+    QUEUED: "⏳ 대기 중", COLLECTING: "📥 수집 중", PROCESSING: "🛠️ 정제 중",
+    DONE: "✅ 완료", FAILED: "❌ 실패", CANCELLED: "⛔ 취소됨",
+}
+
+
+def build_api_url(inputs: dict) -> str:
+    """검색 화면의 입력값으로 OpenAlex API URL을 만듭니다."""
+    inputs = inputs.copy()
+    search_mode = inputs.pop('search_mode')
+    params = url_builder.prepare_params(**inputs)
+    if search_mode == 'broad':
+        return url_builder.create_broad_query(**params)
+    return url_builder.create_precise_query(**params)
+
+
+class SearchJob:
+    """검색 작업 하나의 입력값과 진행 상태입니다. 작업 스레드가 갱신하고, 화면은 주기적으로 읽기만 합니다."""
+
+    def __init__(self, job_id: str, inputs: dict, api_url: str, raw_path: str):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.api_url = api_url
+        self.raw_path = raw_path            # 수집한 원본 JSONL 경로
+        self.state = QUEUED
+        self.items_saved = 0
+        self.total_results = 0
+        self.message = ""
+        self.data_fingerprint = None        # 완료 시 공용 저장소에 등록된 데이터셋 지문
+        self.sketch = streaming_sketch.HarvestSketch()   # 수집 중 실시간 미리보기 요약
+        self.created_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in ACTIVE_STATES
+
+    @property
+    def progress(self) -> float:
+        return min(1.0, self.items_saved / self.total_results) if self.total_results else 0.0
+
+    def update_progress(self, items_saved: int, total_results: int):
+        self.items_saved, self.total_results = items_saved, total_results
+        self.message = f"수집 진행률: {items_saved:,} / {total_results:,} 건"
+
+
+class SearchJobQueue:
+    """
+    프로세스 전체에서 공유하는 검색 작업 대기열입니다.
+    수집(fetch)과 정제(refine)를 작업 스레드에서 실행하므로 화면(스크립트 스레드)은 막히지 않고,
+    브라우저 연결이 끊겨도 작업은 계속 진행됩니다. 완료된 데이터셋은 공용 저장소(dataset_store)에 등록합니다.
+    """
+
+    def __init__(self, store: dataset_store.DatasetStore, job_dir: str, max_workers: int):
+        self.store = store
+        self.job_dir = job_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()   # 작업 ID -> SearchJob (오래된 순)
+
+    def submit(self, inputs: dict) -> str:
+        """검색 작업을 대기열에 넣고 작업 ID를 반환합니다."""
+        job_id = uuid.uuid4().hex[:12]
+        os.makedirs(self.job_dir, exist_ok=True)
+        job = SearchJob(job_id, inputs, build_api_url(inputs), os.path.join(self.job_dir, f"{job_id}.jsonl"))
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job)
+        return job_id
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find_done_job(self, data_fingerprint: str):
+        """해당 데이터셋을 만든 가장 최근의 완료 작업을 반환합니다. (없으면 None)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return next((job for job in reversed(jobs) if job.state == DONE and job.data_fingerprint == data_fingerprint), None)
+
+    def cancel(self, job_id: str):
+        """
+        작업을 취소합니다. 대기 중이면 바로 취소되고, 수집 중이면 다음 페이지 요청 전에 멈춥니다.
+        정제 중이면 현재 단계(정제 / 내보내기 파일 생성)가 끝난 뒤 결과를 등록하지 않고 멈춥니다.
+        """
+        job = self.get(job_id)
+        if job is None or not job.is_active:
+            return
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED, "실행 전에 취소되었습니다.")
+        elif job.state == PROCESSING:
+            job.message = "취소 요청됨: 현재 정제 단계가 끝나면 멈춥니다..."
+
+    def _run(self, job: SearchJob):
+        try:
+            job.state = COLLECTING
+            job.message = "데이터 수집을 시작합니다..."
+            items_saved = data_fetcher.harvest(job.api_url, job.raw_path, on_progress=job.update_progress, should_cancel=job.cancel_event.is_set, on_page=job.sketch.update)
+            if items_saved == 0:
+                self._finish(job, FAILED, "검색 결과가 없습니다.")
+                return
+            if job.cancel_event.is_set():
+                raise data_fetcher.HarvestCancelled(f"{items_saved}건 수집 후 취소되었습니다.")
+
+            job.state = PROCESSING
+            job.message = f"{items_saved:,}건 정제 및 분석 준비 중..."
+            final_df = data_processor.process_and_refine_data(job.raw_path)
+            if final_df.empty:
+                self._finish(job, FAILED, "정제된 데이터가 없습니다.")
+                return
+            self._check_cancelled(job, "정제 후 취소되었습니다.")
+            # 다운로드 파일은 데이터셋 버전(지문)마다 한 번만 만들어 디스크에 저장해 둡니다.
+            data_fingerprint = fingerprint.dataset_fingerprint(final_df)
+            data_exporter.build_exports(final_df, data_fingerprint)
+            self._check_cancelled(job, "내보내기 파일 생성 후 취소되었습니다.")
+            job.data_fingerprint = self.store.put(final_df, fp=data_fingerprint)
+            self._finish(job, DONE, f"총 {len(final_df):,}개의 논문 데이터가 처리되었습니다.")
+        except data_fetcher.HarvestCancelled as e:
+            self._finish(job, CANCELLED, str(e))
+        except requests.exceptions.RequestException as e:
+            self._finish(job, FAILED, f"API 요청 중 에러가 발생했습니다: {e}")
+        except Exception as e:
+            self._finish(job, FAILED, f"알 수 없는 오류가 발생했습니다: {e}")
+
+    def _check_cancelled(self, job: SearchJob, message: str):
+        # 정제 단계는 중간에 멈출 수 없으므로, 단계 사이마다 취소 요청을 확인합니다.
+        if job.cancel_event.is_set():
+            raise data_fetcher.HarvestCancelled(message)
+
+    def _finish(self, job: SearchJob, state: str, message: str):
+        job.state, job.message, job.finished_at = state, message, time.time()
+        print(f"-> 검색 작업 {job.job_id}: {state} ({message})")
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.is_active]
+        for job_id in finished[:max(0, len(self._jobs) - MAX_JOBS)]:
+            job = self._jobs.pop(job_id)
+            # 원본 파일을 메모리 매핑으로 열어 둔 색인을 먼저 닫아야 지울 수 있습니다. (Windows)
+            if os.path.exists(job.raw_path):
+                get_raw_index.clear(job.raw_path, os.path.getmtime(job.raw_path))
+            for path in (job.raw_path, raw_index.sidecar_path(job.raw_path)):
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError as e:
+                    print(f"경고: 작업 파일 삭제 실패: {path} ({e})")
+
+
+@st.cache_resource(max_entries=8, on_release=raw_index.RawIndex.close)
+def get_raw_index(raw_path: str, modified_at: float) -> raw_index.RawIndex:
+    """수집 원본의 사이드카 색인을 열어 둡니다. (파일이 바뀌면 수정 시각이 달라져 다시 엶, 캐시에서 밀려나면 파일을 닫음)"""
+    return raw_index.RawIndex(raw_path)
+
+
+@st.cache_resource
+def get_search_job_queue() -> SearchJobQueue:
+    """프로세스 전체에서 하나만 존재하는 검색 작업 대기열을 반환합니다."""
+    return SearchJobQueue(dataset_store.get_dataset_store(), JOB_DIR, MAX_WORKERS)
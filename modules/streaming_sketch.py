@@ -0,0 +1,122 @@
+# modules/streaming_sketch.py
+import hashlib
+import math
+import threading
+from collections import Counter
+
+# HyperLogLog 레지스터 수 = 2^HLL_PRECISION (12 -> 4096개, 4KB / 표준오차 약 1.6%)
+HLL_PRECISION = 12
+# Space-Saving에서 추적할 후보 수 (화면에는 이 중 상위 PREVIEW_TOP_N개만 표시)
+HEAVY_HITTER_CAPACITY = 200
+PREVIEW_TOP_N = 10
+
+
+class HyperLogLog:
+    """고유값 개수를 고정 크기 메모리로 근사 추정합니다. (값을 저장하지 않고 해시의 선행 0 개수만 기록)"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, value: str):
+        h = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        estimate = self._alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # 값이 적을 때는 빈 레지스터 비율로 추정하는 선형 계수(linear counting)가 더 정확합니다.
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """
+    자주 등장하는 항목(heavy hitter) 상위 k개를 고정 개수의 후보만으로 추적합니다. (Space-Saving 알고리즘)
+    후보가 가득 차면 가장 적게 센 후보를 새 항목으로 바꾸므로, 개수는 실제보다 최대 errors만큼 많을 수 있습니다.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item: str, count: int = 1):
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            del self.errors[victim]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+
+    def top(self, k: int = PREVIEW_TOP_N) -> list:
+        """[(항목, 추정 개수), ...]를 많은 순(같으면 이름순)으로 반환합니다."""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class HarvestSketch:
+    """
+    수집 중인 OpenAlex 원본 레코드로 연도별 논문 수, 고유 저자/기관 수(HLL), 상위 국가/키워드(Space-Saving)를
+    페이지 단위로 갱신합니다. 수집 스레드가 update()를 호출하고, 화면은 snapshot()으로 읽기만 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.papers = 0
+        self.year_counts = Counter()
+        self.authors = HyperLogLog()
+        self.institutions = HyperLogLog()
+        self.countries = SpaceSaving()
+        self.keywords = SpaceSaving()
+
+    def update(self, works: list):
+        """수집한 한 페이지의 레코드를 반영합니다. (data_fetcher.harvest의 on_page 콜백)"""
+        with self._lock:
+            for work in works:
+                self.papers += 1
+                if work.get('publication_year'):
+                    self.year_counts[int(work['publication_year'])] += 1
+
+                first_author_countries = set()
+                for author_info in work.get('authorships') or []:
+                    author = author_info.get('author') or {}
+                    author_key = author.get('id') or author.get('display_name')
+                    if author_key:
+                        self.authors.add(author_key)
+                    for inst in author_info.get('institutions') or []:
+                        inst_key = inst.get('id') or inst.get('display_name')
+                        if inst_key:
+                            self.institutions.add(inst_key)
+                    if author_info.get('author_position') == 'first':
+                        first_author_countries.update(author_info.get('countries') or [])
+                # 기본 동향 대시보드와 같이 주저자 국가 기준으로, 한 논문에서 한 번만 셉니다.
+                for country_code in first_author_countries:
+                    self.countries.add(country_code)
+
+                keywords = {kw.get('display_name', '').strip() for kw in work.get('keywords') or []}
+                for keyword in keywords - {''}:
+                    self.keywords.add(keyword)
+
+    def snapshot(self) -> dict:
+        """화면 표시용 현재 요약을 반환합니다."""
+        with self._lock:
+            return {
+                'papers': self.papers,
+                'year_counts': sorted(self.year_counts.items()),
+                'distinct_authors': self.authors.count(),
+                'distinct_institutions': self.institutions.count(),
+                'top_countries': self.countries.top(),
+                'top_keywords': self.keywords.top(),
+            }
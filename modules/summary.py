@@ -0,0 +1,192 @@
+# modules/summary.py
+import hashlib
+import pandas as pd
+from modules import entity_index
+
+# 요약 형식이 바뀌면 올려서, 예전 파일에 들어있는 요약은 사용하지 않도록 합니다.
+SUMMARY_VERSION = 3
+# 데이터프레임 attrs / 내보내기 파일 메타데이터에서 요약을 담는 키
+SUMMARY_ATTR = 'dashboard_summary'
+TOP_N = 15
+
+# 결측치 현황 표에 보여줄 항목
+MISSING_FIELDS = {
+    'Corresponding_Author_Names': '교신저자', 'First_Author_Country': '주저자 국가', 'fwci': 'FWCI 지수'
+}
+# 고유값 개수를 세는 ';' 구분 컬럼과 단일 값 컬럼
+SPLIT_COUNT_COLUMNS = {
+    'total_authors': 'All_Authors', 'unique_corr_authors': 'Corresponding_Author_Names',
+    'total_institutions': 'All_Institutions', 'unique_corr_inst': 'Corresponding_Institution_Names',
+}
+SINGLE_COUNT_COLUMNS = {
+    'unique_first_authors': 'First_Author_Name', 'unique_first_inst': 'First_Author_Institution',
+}
+# 원본 authorships가 있으면 위 항목들을 이름 대신 OpenAlex ID 기준 개체 테이블로 셉니다. (동명이인/표기 차이 구분)
+ENTITY_COUNT_TABLES = {
+    'total_authors': 'authors', 'unique_first_authors': 'first_authors', 'unique_corr_authors': 'corr_authors',
+    'total_institutions': 'institutions', 'unique_first_inst': 'first_institutions', 'unique_corr_inst': 'corr_institutions',
+    'unique_sources': 'sources',
+}
+# DuckDB 백엔드에서 SPLIT_COUNT_COLUMNS 항목을 세는 개체 테이블 (duckdb_backend.ENTITY_TABLES)
+BACKEND_COUNT_TABLES = {
+    'total_authors': 'authors', 'unique_corr_authors': 'corr_authors',
+    'total_institutions': 'institutions', 'unique_corr_inst': 'corr_institutions',
+}
+MISSING_TOKENS = ['nan', 'None', 'none', 'null', '']
+# 요약 계산에 쓰이는 컬럼: 이 값들(MISSING_FIELDS는 결측 여부)이 같으면 요약도 같으므로, 저장된 요약이 현재 데이터의 것인지 이 컬럼들로 확인합니다.
+SUMMARY_NUMERIC_COLUMNS = ['publication_year', 'cited_by_count']
+SUMMARY_TEXT_COLUMNS = list(dict.fromkeys([
+    *SPLIT_COUNT_COLUMNS.values(), *SINGLE_COUNT_COLUMNS.values(),
+    'First_Author_Country', 'All_Institutions', 'Primary_Topic(Score)',
+    'authorships', 'corresponding_author_ids', 'primary_location',
+]))
+
+
+# --- 1. 데이터셋 식별 (요약이 현재 데이터의 것인지 확인) ---
+def dataset_key(df: pd.DataFrame) -> dict:
+    """
+    행 수와 요약 계산에 쓰이는 컬럼 값 전체의 해시값입니다. 값이 하나라도 바뀌면 다른 값이 되고,
+    파일 형식이 바뀌어도(엑셀/CSV/Parquet) 같은 데이터면 같은 값을 돌려주도록 숫자는 실수로, 결측은 빈 문자열로 맞춰 해싱합니다.
+    (결측 현황에만 쓰이는 컬럼은 결측 여부만 해싱: CSV로 저장/읽기 시 fwci 같은 실수의 마지막 자리가 달라질 수 있음)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for col in dict.fromkeys(SUMMARY_NUMERIC_COLUMNS + SUMMARY_TEXT_COLUMNS + list(MISSING_FIELDS)):
+        if col not in df.columns:
+            continue
+        if col in SUMMARY_NUMERIC_COLUMNS:
+            values = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif col in SUMMARY_TEXT_COLUMNS:
+            values = df[col].astype(object).where(df[col].notna(), '').astype(str)
+        else:
+            values = text_values(df, col).notna()
+        digest.update(col.encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(values, index=False).values.tobytes())
+    return {'row_count': int(len(df)), 'content_digest': digest.hexdigest()}
+
+
+# --- 2. 요약 계산 ---
+def text_values(df: pd.DataFrame, col: str) -> pd.Series:
+    """문자열 컬럼의 공백을 정리하고, 빈 문자열/결측 표기를 결측값으로 바꿉니다. (정제 직후와 업로드 파일의 값을 같게 맞춤)"""
+    values = df[col]
+    if values.dtype != object:
+        return values
+    values = values.map(lambda v: v.strip() if isinstance(v, str) else v)
+    return values.where(~values.isin(MISSING_TOKENS))
+
+
+def split_values(df: pd.DataFrame, col: str) -> pd.Series:
+    """';'로 구분된 컬럼을 펼쳐, 공백을 정리한 빈 문자열이 아닌 항목만 반환합니다."""
+    items = text_values(df, col).dropna().astype(str).str.split(';').explode().str.strip()
+    return items[items.notna() & (items != '')]
+
+
+def top_counts(values: pd.Series, k: int = TOP_N) -> pd.Series:
+    """항목별 개수 상위 k개를 반환합니다. (개수가 같으면 이름순으로 정렬해 DuckDB 집계와 순서를 맞춤)"""
+    counts = values.value_counts()
+    order = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+    return pd.Series([count for _, count in order], index=[name for name, _ in order], dtype='int64')
+
+
+def counts_to_pairs(counts: pd.Series) -> list:
+    """Series(이름 -> 개수)를 JSON으로 저장할 수 있는 [[이름, 개수], ...] 목록으로 바꿉니다."""
+    return [[name if isinstance(name, str) else int(name), int(count)] for name, count in counts.items()]
+
+
+def entity_fields(entities: entity_index.EntityIndex) -> dict:
+    """개체 테이블(정수 코드)로 계산한 고유 저자/기관/저널 수와 상위 기관 목록입니다."""
+    fields = {key: entities.distinct_count(table) for key, table in ENTITY_COUNT_TABLES.items()}
+    fields['top_institutions'] = counts_to_pairs(entities.top('institutions', TOP_N))
+    return fields
+
+
+def compute_summary(df: pd.DataFrame, entities=None) -> dict:
+    """
+    기본 동향 대시보드의 핵심 지표, 결측치 현황, 연도별 논문 수, 상위 국가/기관/토픽을 한 번에 계산합니다.
+    entities를 주지 않으면 데이터의 authorships 원본으로 개체 테이블을 만들어 사용합니다. (없으면 이름 기준)
+    """
+    if entities is None:
+        entities = entity_index.build_entity_index(df)
+    result = {'version': SUMMARY_VERSION, **dataset_key(df)}
+
+    result['total_papers'] = int(len(df))
+    avg_citations = pd.to_numeric(df['cited_by_count'], errors='coerce').mean() if 'cited_by_count' in df.columns else float('nan')
+    result['avg_citations'] = None if pd.isna(avg_citations) else float(avg_citations)
+    for key, col in SPLIT_COUNT_COLUMNS.items():
+        result[key] = int(split_values(df, col).nunique()) if col in df.columns else None
+    for key, col in SINGLE_COUNT_COLUMNS.items():
+        result[key] = int(text_values(df, col).nunique()) if col in df.columns else 0
+
+    result['missing'] = [
+        {'field': field, 'name': name, 'valid_count': int(text_values(df, field).notna().sum())}
+        for field, name in MISSING_FIELDS.items() if field in df.columns
+    ]
+
+    years = pd.to_numeric(df['publication_year'], errors='coerce').dropna().astype(int) if 'publication_year' in df.columns else pd.Series(dtype='int64')
+    result['yearly_counts'] = counts_to_pairs(years.value_counts().sort_index())
+    result['top_countries'] = counts_to_pairs(top_counts(split_values(df, 'First_Author_Country'))) if 'First_Author_Country' in df.columns else []
+    result['top_institutions'] = counts_to_pairs(top_counts(split_values(df, 'All_Institutions'))) if 'All_Institutions' in df.columns else []
+    if 'Primary_Topic(Score)' in df.columns:
+        topics = text_values(df, 'Primary_Topic(Score)').dropna().astype(str).str.split('(').str[0].str.strip()
+        result['top_topics'] = counts_to_pairs(top_counts(topics))
+    else:
+        result['top_topics'] = []
+    result['unique_sources'] = None
+    if entities is not None:
+        result.update(entity_fields(entities))
+    return result
+
+
+def compute_summary_with_backend(df: pd.DataFrame, backend, entities=None) -> dict:
+    """compute_summary와 같은 형식의 요약을 DuckDB 백엔드의 SQL 집계로 계산합니다. (개체 테이블이 있으면 ID 기준 항목은 그것을 사용)"""
+    result = {'version': SUMMARY_VERSION, **dataset_key(df)}
+    result['total_papers'] = int(len(df))
+    avg_citations = backend.column_mean('cited_by_count')
+    result['avg_citations'] = None if pd.isna(avg_citations) else avg_citations
+    if entities is None:
+        # 개체 테이블이 없을 때만 이름 기준으로 셉니다. (있으면 아래 entity_fields가 같은 항목을 ID 기준으로 채움)
+        for key, table in BACKEND_COUNT_TABLES.items():
+            count = backend.distinct_count(table)
+            result[key] = count if isinstance(count, int) else None
+        for key, col in SINGLE_COUNT_COLUMNS.items():
+            result[key] = backend.distinct_count(col)
+    result['missing'] = [
+        {'field': field, 'name': name, 'valid_count': int(text_values(df, field).notna().sum())}
+        for field, name in MISSING_FIELDS.items() if field in df.columns
+    ]
+    result['yearly_counts'] = counts_to_pairs(backend.yearly_counts())
+    result['top_countries'] = counts_to_pairs(backend.top_entities('first_author_countries', TOP_N))
+    if entities is None:
+        result['top_institutions'] = counts_to_pairs(backend.top_entities('institutions', TOP_N))
+    result['top_topics'] = counts_to_pairs(backend.primary_topic_counts(TOP_N))
+    result['unique_sources'] = None
+    if entities is not None:
+        result.update(entity_fields(entities))
+    return result
+
+
+# --- 3. 정제 파이프라인 / 대시보드 연결 ---
+def attach_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """요약을 계산해 데이터프레임 attrs에 담습니다. (내보내기 파일에 함께 저장됨)"""
+    if not df.empty:
+        df.attrs[SUMMARY_ATTR] = compute_summary(df)
+    return df
+
+
+def get_fresh_summary(df: pd.DataFrame):
+    """
+    데이터에 담긴 요약이 현재 형식이고 같은 데이터(행 수, 요약 입력 컬럼 값)의 것이면 반환하고, 없거나 오래되었으면 None을 반환합니다.
+    전체 값을 해싱하므로 대시보드에서는 analysis_cache.get_dashboard_summary로 데이터셋 버전(지문)마다 한 번만 호출합니다.
+    """
+    stored = df.attrs.get(SUMMARY_ATTR)
+    if not isinstance(stored, dict) or stored.get('version') != SUMMARY_VERSION or stored.get('row_count') != len(df):
+        return None
+    if stored.get('content_digest') != dataset_key(df)['content_digest']:
+        return None
+    return stored
+
+
+def pairs_to_series(pairs: list) -> pd.Series:
+    """[[이름, 개수], ...] 목록을 Series(이름 -> 개수)로 되돌립니다."""
+    if not pairs:
+        return pd.Series(dtype='int64')
+    return pd.Series([count for _, count in pairs], index=[name for name, _ in pairs])
@@ -0,0 +1,150 @@
+# modules/text_index.py
+import re
+from collections import Counter
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 색인하는 필드와 비트 (한 논문 안에서 단어가 나타난 필드를 비트 OR로 기록)
+FIELD_BITS = {'title': 1, 'Abstract': 2, 'Keywords(Scores)': 4}
+TITLE_ABSTRACT = FIELD_BITS['title'] | FIELD_BITS['Abstract']
+ALL_FIELDS = TITLE_ABSTRACT | FIELD_BITS['Keywords(Scores)']
+# url_builder와 같은 의미: 넓게 검색(default.search)은 모든 필드, 정확하게 검색/AND 조건은 제목+초록
+MODE_FIELDS = {'broad': ALL_FIELDS, 'precise': TITLE_ABSTRACT}
+
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SCORE_PATTERN = re.compile(r"\s*\([-0-9.eE]+\)")
+
+
+def tokenize(text) -> list:
+    """소문자로 바꾼 단어 목록을 반환합니다. (OpenAlex와 달리 어간 추출은 하지 않음)"""
+    return TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else []
+
+
+def field_text(field: str, value) -> str:
+    """키워드 컬럼은 'memristor (0.812); ...'의 점수를 지우고, ';' 사이도 구절이 이어지지 않도록 구분합니다."""
+    if not isinstance(value, str):
+        return ''
+    if field == 'Keywords(Scores)':
+        return ' | '.join(SCORE_PATTERN.sub('', item) for item in value.split(';'))
+    return value
+
+
+class TextIndex:
+    """
+    제목 / 초록 / 키워드 역색인입니다. 단어 x 논문 희소 행렬(CSC) 하나에 (빈도 << 3 | 필드 비트)를 담아,
+    단어의 게시 목록(논문 행 위치)은 열 하나를 잘라 바로 읽고, BM25 점수도 numpy로 한 번에 계산합니다.
+    """
+
+    def __init__(self, vocabulary: dict, postings: sparse.csc_matrix, doc_lengths: np.ndarray, texts: dict, years: np.ndarray):
+        self.vocabulary = vocabulary        # 단어 -> 열 번호
+        self.postings = postings            # (논문 수 x 단어 수), 값 = 빈도 << 3 | 필드 비트
+        self.doc_lengths = doc_lengths      # 논문별 단어 수 (BM25 문서 길이)
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        self.texts = texts                  # 필드 -> 원문 배열 (구절 확인용, 원본 컬럼 참조)
+        self.years = years                  # 논문별 발행 연도 (없으면 -1)
+
+    @property
+    def n_docs(self) -> int:
+        return self.postings.shape[0]
+
+    def term_postings(self, term: str, fields: int) -> tuple:
+        """단어가 지정 필드에 나타난 (논문 행 위치, 전체 필드 기준 빈도)를 반환합니다."""
+        col = self.vocabulary.get(term)
+        if col is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        start, end = self.postings.indptr[col], self.postings.indptr[col + 1]
+        rows, values = self.postings.indices[start:end].astype(np.int64), self.postings.data[start:end].astype(np.int64)
+        keep = (values & fields) != 0
+        return rows[keep], values[keep] >> 3
+
+    def match_keyword(self, keyword: str, fields: int) -> np.ndarray:
+        """
+        검색어 하나에 해당하는 논문 행 위치(정렬됨)를 반환합니다.
+        여러 단어면 url_builder처럼 구절(따옴표) 검색으로 보아, 모든 단어를 가진 후보 중 단어가 연속으로 나오는 논문만 남깁니다.
+        """
+        tokens = tokenize(keyword)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        matched = None
+        for token in dict.fromkeys(tokens):
+            rows, _ = self.term_postings(token, fields)
+            matched = rows if matched is None else np.intersect1d(matched, rows, assume_unique=True)
+            if matched.size == 0:
+                return matched
+        if len(tokens) == 1:
+            return matched
+        # 단어 사이의 공백/문장부호는 허용하되, 키워드 구분자('|')는 넘지 않습니다.
+        phrase = re.compile(r"(?<!\w)" + r"[^\w|]+".join(re.escape(token) for token in tokens) + r"(?!\w)")
+        selected = [field for field, bit in FIELD_BITS.items() if fields & bit and field in self.texts]
+        keep = [row for row in matched if any(phrase.search(field_text(field, self.texts[field][row]).lower()) for field in selected)]
+        return np.asarray(keep, dtype=np.int64)
+
+    def bm25(self, terms: list, rows: np.ndarray) -> np.ndarray:
+        """주어진 논문들에 대해 검색 단어들의 BM25 점수 합을 계산합니다. (전체 필드 기준)"""
+        scores = np.zeros(self.n_docs)
+        for term in dict.fromkeys(terms):
+            doc_rows, tf = self.term_postings(term, ALL_FIELDS)
+            if doc_rows.size == 0:
+                continue
+            idf = np.log(1 + (self.n_docs - doc_rows.size + 0.5) / (doc_rows.size + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_rows] / (self.avg_length or 1))
+            scores[doc_rows] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores[rows]
+
+    def search(self, or_keywords: list, and_keywords: list = None, mode: str = 'precise', year_range: tuple = None) -> tuple:
+        """
+        url_builder와 같은 의미로 보유한 코퍼스를 검색합니다.
+        OR 검색어 중 하나 이상(모드에 따라 모든 필드 / 제목+초록)과 AND 검색어 전부(제목+초록)를 만족하고,
+        발행 연도가 year_range(시작, 끝) 안에 있는 논문의 (행 위치, BM25 점수)를 점수가 높은 순으로 반환합니다.
+        """
+        and_keywords = and_keywords or []
+        if or_keywords:
+            matched = np.unique(np.concatenate([self.match_keyword(k, MODE_FIELDS[mode]) for k in or_keywords]))
+        else:
+            matched = np.arange(self.n_docs, dtype=np.int64)
+        for keyword in and_keywords:
+            matched = np.intersect1d(matched, self.match_keyword(keyword, TITLE_ABSTRACT), assume_unique=True)
+        if year_range is not None:
+            start_year, end_year = year_range
+            matched = matched[(self.years[matched] >= start_year) & (self.years[matched] <= end_year)]
+
+        terms = [token for keyword in list(or_keywords) + and_keywords for token in tokenize(keyword)]
+        scores = self.bm25(terms, matched) if terms else np.zeros(matched.size)
+        order = np.lexsort((matched, -scores))
+        return matched[order], scores[order]
+
+
+def build_text_index(df: pd.DataFrame) -> TextIndex:
+    """제목 / 초록 / 키워드 컬럼으로 역색인을 만듭니다. (없는 컬럼은 건너뜀)"""
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    doc_lengths = np.zeros(len(df), dtype=np.float64)
+    fields = [field for field in FIELD_BITS if field in df.columns]
+    texts = {field: df[field].to_numpy(dtype=object) for field in fields}
+
+    for row in range(len(df)):
+        counts, masks = Counter(), {}
+        for field in fields:
+            tokens = tokenize(field_text(field, texts[field][row]))
+            counts.update(tokens)
+            for token in set(tokens):
+                masks[token] = masks.get(token, 0) | FIELD_BITS[field]
+        doc_lengths[row] = sum(counts.values())
+        for token, tf in counts.items():
+            col = vocabulary.setdefault(token, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+            values.append((tf << 3) | masks[token])
+
+    postings = sparse.csc_matrix(
+        (np.asarray(values, dtype=np.int64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(df), len(vocabulary)))
+    postings.sort_indices()
+    years = pd.to_numeric(df['publication_year'], errors='coerce').fillna(-1).astype(np.int64).to_numpy() \
+        if 'publication_year' in df.columns else np.full(len(df), -1, dtype=np.int64)
+    return TextIndex(vocabulary, postings, doc_lengths, texts, years)
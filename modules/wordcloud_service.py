@@ -0,0 +1,116 @@
+# modules/wordcloud_service.py
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+import streamlit as st
+
+CACHE_DIR = os.path.join("data", "wordclouds")
+MAX_CACHED_IMAGES = 64   # 디스크에 보관할 워드클라우드 이미지 수 (LRU)
+MAX_WORDS = 150
+# 작업 디렉터리와 무관하게 저장소의 fonts 폴더를 가리킵니다.
+DEFAULT_FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fonts', 'Lato-Black.ttf')
+MAX_FAILED_KEYS = 256    # 실패 결과를 기억해 둘 캐시 키 수
+WAIT_TIMEOUT = 60        # wait()가 렌더링 완료를 기다리는 최대 시간(초)
+
+
+def render_png(frequencies: dict, path: str, width: int, height: int, colormap: str, font_path: str):
+    """워드클라우드를 그려 PNG 파일로 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    # wordcloud는 PIL / matplotlib까지 불러오므로, 실제로 이미지를 그릴 때(작업 스레드)에서만 import 합니다.
+    from wordcloud import WordCloud
+    wc = WordCloud(
+        width=width, height=height, background_color='white',
+        colormap=colormap, max_words=MAX_WORDS, relative_scaling=0.3, font_path=font_path
+    ).generate_from_frequencies(frequencies)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    wc.to_image().save(tmp_path, format='PNG')
+    os.replace(tmp_path, path)
+
+
+class WordCloudService:
+    """
+    (빈도, 크기, 컬러맵, 폰트)의 해시값으로 렌더링된 PNG를 디스크에 캐싱하고,
+    캐시에 없는 이미지는 백그라운드 스레드에서 그립니다.
+    생성에 실패한 키는 기억해 두어, 같은 요청을 다시 제출하지 않고 계속 'failed'를 반환합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wordcloud")
+        self._lock = threading.Lock()
+        self._pending = {}   # 캐시 키 -> Future
+        self._failed = {}    # 캐시 키 -> 실패 메시지 (삽입 순서대로 오래된 것부터 제거)
+
+    def get(self, frequencies: dict, width: int = 800, height: int = 500, colormap: str = 'viridis', font_path: str = DEFAULT_FONT_PATH) -> tuple:
+        """
+        (상태, PNG 경로)를 반환합니다. 상태는 'ready', 'pending', 'failed' 중 하나입니다.
+        캐시에 없으면 백그라운드 렌더링을 시작하고 'pending'을 반환합니다.
+        """
+        top_items = self._top_items(frequencies)
+        key = self._key(top_items, width, height, colormap, font_path)
+        path = os.path.join(self.cache_dir, f"{key}.png")
+
+        with self._lock:
+            if os.path.exists(path):
+                os.utime(path)  # LRU: 최근 사용 시각 갱신
+                return 'ready', path
+            if key in self._failed:
+                return 'failed', None
+            future = self._pending.get(key)
+            if future is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                future = self._executor.submit(render_png, dict(top_items), path, width, height, colormap, font_path)
+                future.add_done_callback(lambda _: self._evict_if_needed())
+                self._pending[key] = future
+                return 'pending', None
+            if not future.done():
+                return 'pending', None
+            self._pending.pop(key, None)
+            if future.exception() is not None:
+                print(f"경고: 워드클라우드 생성 실패: {future.exception()}")
+                self._failed[key] = str(future.exception())
+                while len(self._failed) > MAX_FAILED_KEYS:
+                    self._failed.pop(next(iter(self._failed)))
+                return 'failed', None
+        return self.get(frequencies, width, height, colormap, font_path)
+
+    def wait(self, frequencies: dict, width: int = 800, height: int = 500, colormap: str = 'viridis',
+             font_path: str = DEFAULT_FONT_PATH, timeout: float = WAIT_TIMEOUT) -> tuple:
+        """get()과 같지만, 렌더링 중이면 끝날 때까지(최대 timeout초) 기다린 뒤 (상태, PNG 경로)를 반환합니다."""
+        status, path = self.get(frequencies, width, height, colormap, font_path)
+        if status != 'pending':
+            return status, path
+        with self._lock:
+            future = self._pending.get(self._key(self._top_items(frequencies), width, height, colormap, font_path))
+        if future is not None:
+            wait_futures([future], timeout=timeout)
+        return self.get(frequencies, width, height, colormap, font_path)
+
+    @staticmethod
+    def _top_items(frequencies: dict) -> list:
+        # 워드클라우드는 상위 MAX_WORDS개 단어만 사용하므로, 나머지는 해시/렌더링에서 제외합니다.
+        return sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))[:MAX_WORDS]
+
+    @staticmethod
+    def _key(top_items: list, width: int, height: int, colormap: str, font_path: str) -> str:
+        return hashlib.blake2b(
+            json.dumps([top_items, width, height, colormap, font_path], ensure_ascii=False, default=str).encode('utf-8'),
+            digest_size=16,
+        ).hexdigest()
+
+    def _evict_if_needed(self):
+        with self._lock:
+            files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.png')]
+            if len(files) <= self.max_entries:
+                return
+            files.sort(key=os.path.getmtime)
+            for old_path in files[:len(files) - self.max_entries]:
+                os.remove(old_path)
+
+
+@st.cache_resource
+def get_wordcloud_service() -> WordCloudService:
+    """프로세스 전체에서 하나만 존재하는 워드클라우드 서비스를 반환합니다."""
+    return WordCloudService(CACHE_DIR, MAX_CACHED_IMAGES)
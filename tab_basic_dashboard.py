@@ -4,8 +4,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+from modules import data_ingest, analysis_cache, summary, profiler
 
-def render(df: pd.DataFrame, data_type: str):
+@profiler.traced
+def render(df: pd.DataFrame, data_type: str, data_fingerprint: str = None):
     st.header("📊 데이터 기본 동향")
 
     # 1. 현재 모드가 '분석 모드'일 때만 대시보드를 보여줍니다.
@@ -16,36 +18,28 @@ def render(df: pd.DataFrame, data_type: str):
         # --- 1. 한눈에 보는 핵심 요약 ---
         st.subheader("🔢 한눈에 보는 핵심 요약")
 
-        # 각 컬럼의 존재 여부를 확인하며 안전하게 계산
-        total_papers = len(df)
-        avg_citations = df.get('cited_by_count', pd.Series(dtype='float')).mean()
-
-        if 'All_Authors' in df.columns:
-            total_authors = df['All_Authors'].dropna().str.split(';').explode().str.strip().nunique()
-        else: total_authors = "N/A"
-
-        unique_first_authors = df.get('First_Author_Name', pd.Series(dtype='str')).nunique()
-
-        if 'Corresponding_Author_Names' in df.columns:
-            unique_corr_authors = df['Corresponding_Author_Names'].dropna().str.split(';').explode().str.strip().nunique()
-        else: unique_corr_authors = "N/A"
-
-        if 'All_Institutions' in df.columns:
-            total_institutions = df['All_Institutions'].dropna().str.split(';').explode().str.strip().nunique()
-        else: total_institutions = "N/A"
-
-        unique_first_inst = df.get('First_Author_Institution', pd.Series(dtype='str')).nunique()
-
-        if 'Corresponding_Institution_Names' in df.columns:
-            unique_corr_inst = df['Corresponding_Institution_Names'].dropna().str.split(';').explode().str.strip().nunique()
-        else: unique_corr_inst = "N/A"
+        # 정제 단계에서 만들어 파일에 함께 저장한 요약이 있으면 그대로 사용하고,
+        # 없거나 다른 데이터의 것이면 데이터셋 버전(지문)마다 한 번만 새로 계산합니다.
+        with profiler.span("tab_basic_dashboard.summary"):
+            dashboard_summary = analysis_cache.get_dashboard_summary(data_fingerprint, df)
+
+        total_papers = dashboard_summary['total_papers']
+        avg_citations = dashboard_summary['avg_citations']
+        total_authors = dashboard_summary['total_authors'] if dashboard_summary['total_authors'] is not None else "N/A"
+        unique_first_authors = dashboard_summary['unique_first_authors']
+        unique_corr_authors = dashboard_summary['unique_corr_authors'] if dashboard_summary['unique_corr_authors'] is not None else "N/A"
+        total_institutions = dashboard_summary['total_institutions'] if dashboard_summary['total_institutions'] is not None else "N/A"
+        unique_first_inst = dashboard_summary['unique_first_inst']
+        unique_corr_inst = dashboard_summary['unique_corr_inst'] if dashboard_summary['unique_corr_inst'] is not None else "N/A"
+        unique_sources = dashboard_summary.get('unique_sources')
 
         # 요약 정보 탭으로 표시
         tab1, tab2, tab3 = st.tabs(["종합 현황", "👤 연구자 현황", "🏢 연구기관 현황"])
         with tab1:
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             col1.metric("총 논문 수", f"{total_papers:,}")
-            col2.metric("평균 피인용 수", f"{avg_citations:.1f}" if pd.notna(avg_citations) else "N/A")
+            col2.metric("평균 피인용 수", f"{avg_citations:.1f}" if avg_citations is not None else "N/A")
+            col3.metric("게재 저널 수(고유)", f"{unique_sources:,}" if isinstance(unique_sources, int) else "N/A")
         with tab2:
             col1, col2, col3 = st.columns(3)
             col1.metric("총 저자 수(전체)", f"{total_authors:,}" if isinstance(total_authors, int) else total_authors)
@@ -60,16 +54,11 @@ def render(df: pd.DataFrame, data_type: str):
 
         # --- 2. 결측치 현황 ---
         with st.expander("분석 데이터 상세 정보 보기 (결측치 현황)"):
-            total_rows = len(df)
-            key_fields = {
-                'Corresponding_Author_Names': '교신저자', 'First_Author_Country': '주저자 국가', 'fwci': 'FWCI 지수'
-            }
+            total_rows = total_papers
             summary_data = []
-            for field, name in key_fields.items():
-                if field in df.columns:
-                    valid_count = df[field].notna().sum()
-                    missing_rate = (1 - valid_count / total_rows) * 100 if total_rows > 0 else 0
-                    summary_data.append({"항목": name, "데이터 보유율": f"{100-missing_rate:.1f}%", "결측률": f"{missing_rate:.1f}%"})
+            for item in dashboard_summary['missing']:
+                missing_rate = (1 - item['valid_count'] / total_rows) * 100 if total_rows > 0 else 0
+                summary_data.append({"항목": item['name'], "데이터 보유율": f"{100-missing_rate:.1f}%", "결측률": f"{missing_rate:.1f}%"})
 
             if summary_data:
                 st.dataframe(pd.DataFrame(summary_data), hide_index=True, use_container_width=True)
@@ -82,8 +71,8 @@ def render(df: pd.DataFrame, data_type: str):
 
         with col_graph1:
             st.markdown("###### 연도별 논문 발행 동향")
-            if 'publication_year' in df.columns and df['publication_year'].notna().any():
-                yearly_counts = df['publication_year'].dropna().astype(int).value_counts().sort_index()
+            yearly_counts = summary.pairs_to_series(dashboard_summary['yearly_counts'])
+            if not yearly_counts.empty:
                 fig_yearly = px.bar(yearly_counts, x=yearly_counts.index, y=yearly_counts.values, labels={'x': '발행 연도', 'y': '논문 수'})
                 fig_yearly.update_traces(marker_color='#418cdc' )
                 st.plotly_chart(fig_yearly, use_container_width=True)
@@ -94,9 +83,8 @@ def render(df: pd.DataFrame, data_type: str):
                 st.warning("발행 연도 데이터가 없어 분석할 수 없습니다.")
 
             st.markdown("###### 국가별 연구 동향 (주저자 국가 기준 Top 15)")
-            if 'First_Author_Country' in df.columns and df['First_Author_Country'].notna().any():
-                country_series = df['First_Author_Country'].dropna().str.split(';').explode().str.strip()
-                country_counts = country_series.value_counts().nlargest(15)
+            country_counts = summary.pairs_to_series(dashboard_summary['top_countries'])
+            if not country_counts.empty:
                 fig_country = px.bar(country_counts, y=country_counts.index, x=country_counts.values, orientation='h', labels={'y': '국가', 'x': '논문 수'})
                 fig_country.update_traces(marker_color='#418cdc')
                 fig_country.update_layout(yaxis={'categoryorder':'total ascending'})
@@ -109,10 +97,8 @@ def render(df: pd.DataFrame, data_type: str):
 
         with col_graph2:
             st.markdown("###### 핵심 연구 기관 (논문 수 기준 Top 15)")
-            if 'All_Institutions' in df.columns and df['All_Institutions'].notna().any():
-                institution_series = df['All_Institutions'].dropna().str.split(';').explode().str.strip()
-                non_blank_institutions = institution_series[institution_series != '']
-                institution_counts = non_blank_institutions.value_counts().nlargest(15)
+            institution_counts = summary.pairs_to_series(dashboard_summary['top_institutions'])
+            if not institution_counts.empty:
                 fig_inst = px.bar(institution_counts, y=institution_counts.index, x=institution_counts.values, orientation='h', labels={'y': '연구 기관', 'x': '논문 수'})
                 fig_inst.update_layout(yaxis={'categoryorder':'total ascending'})
                 fig_inst.update_traces(marker_color='#418cdc')
@@ -125,9 +111,8 @@ def render(df: pd.DataFrame, data_type: str):
                 st.warning("연구 기관 데이터가 없어 분석할 수 없습니다.")
 
             st.markdown("###### 주요 연구 토픽 (Primary Topic 기준 Top 15)")
-            if 'Primary_Topic(Score)' in df.columns and df['Primary_Topic(Score)'].notna().any():
-                df['Primary_Topic_Clean'] = df['Primary_Topic(Score)'].str.split('(').str[0].str.strip()
-                topic_counts = df['Primary_Topic_Clean'].value_counts().nlargest(15)
+            topic_counts = summary.pairs_to_series(dashboard_summary['top_topics'])
+            if not topic_counts.empty:
                 fig_topic = px.bar(topic_counts, y=topic_counts.index, x=topic_counts.values, orientation='h', labels={'y': '주요 토픽', 'x': '빈도 수'})
                 fig_topic.update_layout(yaxis={'categoryorder':'total ascending'})
                 fig_topic.update_traces(marker_color='#418cdc')
@@ -144,17 +129,15 @@ def render(df: pd.DataFrame, data_type: str):
 
         uploaded_file = st.file_uploader(
             "분석할 엑셀(csv) 파일을 업로드하세요.",
-            type=['csv', 'xlsx'],
+            type=['csv', 'xlsx', 'gz', 'parquet'],
             key="dashboard_uploader"
         )
 
         if uploaded_file is not None:
-            # 파일이 업로드되면, main.py에 처리할 '액션'을 등록합니다.
+            # 파일이 업로드되면, 공용 업로드 처리기를 통해 main.py에 '액션'을 등록합니다.
             try:
-                uploaded_df = pd.read_csv(uploaded_file) if uploaded_file.name.endswith('.csv') else pd.read_excel(uploaded_file)
-                # '작업 지시서' 등록
-                st.session_state.pending_action = ('UPLOAD_ACTION', uploaded_df)
-                # main.py가 액션을 처리하도록 즉시 재로딩 요청
-                st.rerun()
+                if data_ingest.submit_upload(uploaded_file, "dashboard_uploader"):
+                    # main.py가 액션을 처리하도록 즉시 재로딩 요청
+                    st.rerun()
             except Exception as e:
-                st.error(f"파일을 읽는 중 오류가 발생했습니다: {e}")
\ No newline at end of file
+                st.error(f"파일을 읽는 중 오류가 발생했습니다: {e}")
@@ -1,11 +1,10 @@
 # 파일 이름: tab_search.py (전략 적용 후 수정된 버전)
 
-import streamlit as st
-import datetime
 import os
+import streamlit as st
 import pandas as pd
-import io
-from modules import url_builder, data_fetcher, data_processor
+import datetime
+from modules import data_exporter, dataset_store, data_preview, search_jobs, profiler
 
 # 기본 검색어 설정
 DEFAULT_OR_KEYWORDS = (
@@ -18,9 +17,99 @@ DEFAULT_OR_KEYWORDS = (
 
 def initialize_session_state():
     """세션 상태를 초기화하는 함수"""
-    if 'search_step' not in st.session_state:
-        st.session_state.search_step = "start"
+    # 이 세션이 제출한 검색 작업 ID 목록. URL(query params)에도 기록하여, 새로고침/재접속 후에도 진행 상황을 다시 볼 수 있게 합니다.
+    if 'search_jobs' not in st.session_state:
+        queue = search_jobs.get_search_job_queue()
+        job_ids = [job_id for job_id in st.query_params.get_all("job") if queue.get(job_id) is not None]
+        st.session_state.search_jobs = job_ids
+    # 완료되면 자동으로 불러올 작업 (가장 최근에 제출한 작업)
+    if 'search_autoload_job' not in st.session_state:
+        st.session_state.search_autoload_job = None
+
+def sync_job_query_params():
+    st.query_params["job"] = st.session_state.search_jobs
+
+# ==============================================================================
+# 검색 작업 목록: 진행 중인 작업이 있으면 이 영역만 2초마다 다시 실행하여 상태를 갱신합니다.
+# ==============================================================================
+@profiler.traced
+def render_job_list():
+    queue = search_jobs.get_search_job_queue()
+    for job_id in reversed(st.session_state.search_jobs):
+        job = queue.get(job_id)
+        if job is None:
+            continue
+        with st.container(border=True):
+            col_info, col_action = st.columns([4, 1], vertical_alignment="center")
+            with col_info:
+                keywords = job.inputs.get('and_keywords_input') or job.inputs.get('or_keywords_input', '')
+                st.markdown(f"**{search_jobs.STATE_LABELS[job.state]}** · `{job_id}` · {keywords[:60]} ({job.inputs['start_year']}–{job.inputs['end_year']})")
+                if job.state == search_jobs.COLLECTING:
+                    st.progress(job.progress)
+                st.caption(job.message)
+            # 수집/정제가 끝나기 전에도 지금까지 받은 데이터로 검색 조건이 적절한지 판단할 수 있게 합니다.
+            if job.is_active and job.sketch.papers:
+                render_live_preview(job)
+            with col_action:
+                if job.is_active:
+                    if st.button("취소", key=f"cancel_{job_id}", use_container_width=True):
+                        queue.cancel(job_id)
+                        st.rerun(scope="fragment")
+                elif job.state == search_jobs.DONE and job.data_fingerprint != st.session_state.get('data_fingerprint'):
+                    if st.button("결과 불러오기", key=f"load_{job_id}", type="primary", use_container_width=True):
+                        load_job_result(job)
+            with st.expander("API URL 보기"):
+                st.code(f"API URL: {job.api_url}", language="text")
+
+        # 가장 최근에 제출한 작업이 끝나면 결과를 자동으로 불러옵니다.
+        if job_id == st.session_state.search_autoload_job and job.state == search_jobs.DONE:
+            st.session_state.search_autoload_job = None
+            load_job_result(job)
+
+def render_live_preview(job):
+    """수집 중 실시간 요약(연도별 논문 수, 고유 저자/기관 수 추정, 상위 국가/키워드)을 보여줍니다."""
+    preview = job.sketch.snapshot()
+    with st.expander(f"📈 실시간 미리보기 (수집된 {preview['papers']:,}건 기준)", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("수집된 논문 수", f"{preview['papers']:,}")
+        col2.metric("고유 저자 수(추정)", f"≈ {preview['distinct_authors']:,}")
+        col3.metric("고유 기관 수(추정)", f"≈ {preview['distinct_institutions']:,}")
+        if preview['year_counts']:
+            years = pd.DataFrame(preview['year_counts'], columns=['연도', '논문 수']).astype({'연도': str}).set_index('연도')
+            st.bar_chart(years, height=200)
+        col_country, col_keyword = st.columns(2)
+        with col_country:
+            st.caption("상위 주저자 국가")
+            st.dataframe(pd.DataFrame(preview['top_countries'], columns=['국가', '논문 수']), hide_index=True, use_container_width=True)
+        with col_keyword:
+            st.caption("상위 키워드")
+            st.dataframe(pd.DataFrame(preview['top_keywords'], columns=['키워드', '논문 수']), hide_index=True, use_container_width=True)
+
+# 한 번에 조회할 수 있는 최대 논문 수
+MAX_RAW_LOOKUP = 20
+
+def render_raw_lookup(raw_path: str, default_id: str):
+    """논문 ID로 수집 원본(JSONL)의 레코드를 사이드카 색인으로 바로 찾아 보여줍니다. (전체 저자/소속 정보 확인용)"""
+    ids_text = st.text_area("논문 ID (OpenAlex ID, 한 줄에 하나 또는 쉼표로 구분)", value=default_id, key="raw_lookup_ids")
+    work_ids = [token.strip() for token in ids_text.replace(',', '\n').splitlines() if token.strip()][:MAX_RAW_LOOKUP]
+    if not work_ids:
+        return
+    index = search_jobs.get_raw_index(raw_path, os.path.getmtime(raw_path))
+    for work_id, record in zip(work_ids, index.get_many(work_ids)):
+        if record is None:
+            st.warning(f"'{work_id}' 논문을 수집 원본에서 찾을 수 없습니다.")
+        else:
+            st.markdown(f"**{record.get('title') or work_id}**")
+            st.json(record, expanded=False)
+
+def load_job_result(job):
+    # 상태를 직접 수정하는 대신, main.py에 처리할 '액션'을 등록하고 앱 전체를 다시 실행합니다.
+    st.session_state.pending_action = ('SEARCH_JOB_ACTION', job.data_fingerprint)
+    st.rerun()
+
+poll_job_list = st.fragment(run_every=2)(render_job_list)
 
+@profiler.traced
 def render(): # ✨ 인자는 받지 않습니다.
     """논문 검색, 수집, 정제 워크플로우를 담당하는 UI와 로직을 렌더링합니다."""
 
@@ -30,147 +119,122 @@ def render(): # ✨ 인자는 받지 않습니다.
     # 1. UI (입력 섹션)
     # ==============================================================================
 
-    if st.session_state.search_step in ["start", "done"]:
-        with st.container(border=True):
-            st.header("1. 검색 조건 설정")
-
-            # --- 필수 입력: 이메일 주소 (강조된 안내 메시지와 함께) ---
-            st.info("ℹ️ **반드시 본인의 이메일 주소를 입력해야 검색 결과를 받을 수 있습니다.** (OpenAlex API 정책)")
-            email = st.text_input(
-                label="API 사용 이메일 주소 (필수)",
-                placeholder="your.email@company.com",
-                value="",
-                key="api_email_input"
-            )
-
-            col1, col2 = st.columns(2)
-
-            with col1:
-                or_keywords_input = st.text_area("OR 키워드 (하나라도 포함)", value=DEFAULT_OR_KEYWORDS, height=250, key="or_keywords")
-            with col2:
-                and_keywords_input = st.text_area("AND 키워드 (모두 포함)", "neuromorphic", height=100, key="and_keywords")
-
-                st.markdown("---")
-                st.subheader("2. 검색 기간")
-                current_year = datetime.datetime.now().year
-
-                sub_col1, sub_col2 = st.columns(2)
-                with sub_col1:
-                    start_year = st.number_input("시작 연도", min_value=1980, max_value=current_year + 1, value=2015, key='start_year')
-                with sub_col2:
-                    end_year = st.number_input("종료 연도", min_value=1980, max_value=current_year + 1, value=current_year, key='end_year')
-
-            if start_year > end_year:
-                st.error("오류: 시작 연도는 종료 연도보다 클 수 없습니다.")
-                st.stop()
-
-            with st.expander("상세 검색 조건 펼치기"):
-                type_options = {
-                    '학술 논문 (Article)': 'article', '학회 발표 자료 (Conference Paper)': 'conference',
-                    '도서 챕터 (Book Chapter)': 'book-chapter', '리뷰 (Review)': 'review', '학위 논문 (Dissertation)': 'dissertation'
-                }
-                selected_includes = st.multiselect("포함할 문서 유형", options=list(type_options.keys()), default=['학술 논문 (Article)', '학회 발표 자료 (Conference Paper)'], key="doc_types")
-
-                search_mode_option = st.radio("검색 범위", ('넓게 검색 (포괄적)', '정확하게 검색 (핵심적)'), horizontal=True, key="search_mode")
-
-        # --- 데이터 수집 시작 버튼 ---
-        if st.button("논문 데이터 수집 및 정제 시작", type="primary", use_container_width=True):
-            if not email or "@" not in email:
-                st.error("필수 항목인 이메일 주소를 올바르게 입력해주세요.")
-            else:
-                st.session_state.search_step = "collecting"
-                st.session_state.ui_inputs = {
-                    "email": email,
-                    "or_keywords_input": or_keywords_input,
-                    "and_keywords_input": and_keywords_input,
-                    "start_year": start_year,
-                    "end_year": end_year,
-                    "include_types_values": [type_options[key] for key in selected_includes],
-                    "search_mode": 'broad' if '넓게' in search_mode_option else 'precise'
-                }
-                st.rerun()
-
-    # ==============================================================================
-    # 2. 데이터 수집 단계 (백그라운드 로직)
-    # ==============================================================================
-    if st.session_state.search_step == "collecting":
-        with st.spinner("1/2 - URL 생성 및 데이터 수집 중..."):
-            inputs = st.session_state.ui_inputs.copy()
-            search_mode = inputs.pop('search_mode')
-            params = url_builder.prepare_params(**inputs)
-            if search_mode == 'broad':
-                api_url = url_builder.create_broad_query(**params)
-            else:
-                api_url = url_builder.create_precise_query(**params)
-            st.code(f"API URL: {api_url}", language="text")
-            DATA_DIR = "data"
-            if not os.path.exists(DATA_DIR): os.makedirs(DATA_DIR)
-            output_filepath = os.path.join(DATA_DIR, "collected_data.jsonl")
-            data_fetcher.fetch_and_save_incrementally(api_url, output_filepath)
-            st.session_state['data_filepath'] = output_filepath
-            st.session_state.search_step = "processing"
-            st.rerun()
+    with st.container(border=True):
+        st.header("1. 검색 조건 설정")
+
+        # --- 필수 입력: 이메일 주소 (강조된 안내 메시지와 함께) ---
+        st.info("ℹ️ **반드시 본인의 이메일 주소를 입력해야 검색 결과를 받을 수 있습니다.** (OpenAlex API 정책)")
+        email = st.text_input(
+            label="API 사용 이메일 주소 (필수)",
+            placeholder="your.email@company.com",
+            value="",
+            key="api_email_input"
+        )
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            or_keywords_input = st.text_area("OR 키워드 (하나라도 포함)", value=DEFAULT_OR_KEYWORDS, height=250, key="or_keywords")
+        with col2:
+            and_keywords_input = st.text_area("AND 키워드 (모두 포함)", "neuromorphic", height=100, key="and_keywords")
+
+            st.markdown("---")
+            st.subheader("2. 검색 기간")
+            current_year = datetime.datetime.now().year
+
+            sub_col1, sub_col2 = st.columns(2)
+            with sub_col1:
+                start_year = st.number_input("시작 연도", min_value=1980, max_value=current_year + 1, value=2015, key='start_year')
+            with sub_col2:
+                end_year = st.number_input("종료 연도", min_value=1980, max_value=current_year + 1, value=current_year, key='end_year')
+
+        if start_year > end_year:
+            st.error("오류: 시작 연도는 종료 연도보다 클 수 없습니다.")
+            st.stop()
+
+        with st.expander("상세 검색 조건 펼치기"):
+            type_options = {
+                '학술 논문 (Article)': 'article', '학회 발표 자료 (Conference Paper)': 'conference',
+                '도서 챕터 (Book Chapter)': 'book-chapter', '리뷰 (Review)': 'review', '학위 논문 (Dissertation)': 'dissertation'
+            }
+            selected_includes = st.multiselect("포함할 문서 유형", options=list(type_options.keys()), default=['학술 논문 (Article)', '학회 발표 자료 (Conference Paper)'], key="doc_types")
+
+            search_mode_option = st.radio("검색 범위", ('넓게 검색 (포괄적)', '정확하게 검색 (핵심적)'), horizontal=True, key="search_mode")
+
+    # --- 데이터 수집 시작 버튼 ---
+    if st.button("논문 데이터 수집 및 정제 시작", type="primary", use_container_width=True):
+        if not email or "@" not in email:
+            st.error("필수 항목인 이메일 주소를 올바르게 입력해주세요.")
+        else:
+            inputs = {
+                "email": email,
+                "or_keywords_input": or_keywords_input,
+                "and_keywords_input": and_keywords_input,
+                "start_year": start_year,
+                "end_year": end_year,
+                "include_types_values": [type_options[key] for key in selected_includes],
+                "search_mode": 'broad' if '넓게' in search_mode_option else 'precise'
+            }
+            # 수집과 정제는 백그라운드 작업으로 실행됩니다. (여러 검색을 대기열에 넣을 수 있음)
+            job_id = search_jobs.get_search_job_queue().submit(inputs)
+            st.session_state.search_jobs.append(job_id)
+            st.session_state.search_autoload_job = job_id
+            sync_job_query_params()
+            st.toast("검색 작업이 대기열에 추가되었습니다. 진행 상황은 아래에서 확인하세요.")
 
     # ==============================================================================
-    # 3. 데이터 정제 단계 (백그라운드 로직)
+    # 2. 검색 작업 진행 상황 (백그라운드 수집 및 정제)
     # ==============================================================================
-    if st.session_state.search_step == "processing":
-        filepath = st.session_state['data_filepath']
-        with st.spinner(f"2/2 - '{os.path.basename(filepath)}' 파일 정제 및 분석 준비 중..."):
-            final_df = data_processor.process_and_refine_data(filepath)
-
-            # ✨✨✨ --- 여기가 유일한 핵심 수정 지점 --- ✨✨✨
-            # 1. 상태를 직접 수정하는 대신, main.py에 처리할 '액션'을 등록합니다.
-            st.session_state.pending_action = ('SEARCH_ACTION', final_df)
-
-            # 2. 이 탭에서 사용했던 임시 데이터(final_df)는 이제 세션에 저장할 필요가 없습니다.
-            #    (주석 처리 또는 삭제)
-            # st.session_state['final_df'] = final_df
-
-            # 3. 이 탭의 상태를 '완료'로 변경합니다.
-            st.session_state.search_step = "done"
-
-            # 4. main.py가 액션을 처리하도록 즉시 재로딩(rerun)을 요청합니다.
-            st.rerun()
-            # ✨✨✨ --- 수정 끝 --- ✨✨✨
+    if st.session_state.search_jobs:
+        st.subheader("📋 검색 작업")
+        queue = search_jobs.get_search_job_queue()
+        if any(queue.get(job_id) is not None and queue.get(job_id).is_active for job_id in st.session_state.search_jobs):
+            poll_job_list()
+        else:
+            render_job_list()
 
     # ==============================================================================
-    # 4. 최종 결과 표시 및 다운로드/초기화
+    # 3. 최종 결과 표시 및 다운로드/초기화
     # ==============================================================================
-    if st.session_state.search_step == "done":
+    if st.session_state.get('data_type') == 'search':
         st.subheader("✅ 수집 및 정제 완료")
 
-        # 이제 데이터는 중앙 저장소인 st.session_state.data 에서 가져옵니다.
-        final_df = st.session_state.get('data', pd.DataFrame())
+        # 이제 데이터는 중앙 저장소(dataset_store)에서 세션이 참조하는 지문으로 가져옵니다.
+        final_df = dataset_store.get_session_dataset()
 
-        if not final_df.empty and st.session_state.get('data_type') == 'search':
+        if not final_df.empty:
             st.info(f"총 {len(final_df)}개의 논문 데이터가 처리되었습니다. 현재 '검색 모드'가 활성화 되었습니다.")
             with st.expander("처리된 데이터 미리보기"):
-                st.dataframe(final_df)
-
-            @st.cache_data
-            def convert_df_to_excel(df):
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=False, sheet_name='Sheet1')
-                return output.getvalue()
-
-            excel_data = convert_df_to_excel(final_df)
-            st.download_button(label="📥 정제된 데이터(엑셀) 다운로드", data=excel_data, file_name="refined_paper_data.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+                # 전체 표를 보내지 않고, 선택한 컬럼의 현재 페이지만 잘라서 보여줍니다.
+                data_preview.render_preview(final_df, key="search_preview")
+
+            # 이 데이터셋을 만든 검색 작업의 수집 원본이 남아 있으면 논문 ID로 원본 레코드를 조회할 수 있습니다.
+            source_job = search_jobs.get_search_job_queue().find_done_job(st.session_state.data_fingerprint)
+            if source_job is not None and os.path.exists(source_job.raw_path):
+                with st.expander("🔎 원본 레코드 조회 (논문 ID)"):
+                    render_raw_lookup(source_job.raw_path, str(final_df['id'].iloc[0]) if 'id' in final_df.columns else "")
+
+            # 처리 단계에서 미리 만들어 둔 파일을 디스크에서 바로 내려줍니다. (없으면 이때 한 번 생성)
+            export_paths = data_exporter.build_exports(final_df, st.session_state.data_fingerprint)
+            download_cols = st.columns(max(1, len(export_paths)))
+            for col, (fmt, path) in zip(download_cols, export_paths.items()):
+                extension, mime, label = data_exporter.EXPORT_FORMATS[fmt]
+                with col, open(path, 'rb') as f:
+                    st.download_button(label=f"📥 정제된 데이터({label}) 다운로드", data=f, file_name=f"{data_exporter.EXPORT_BASENAME}.{extension}", mime=mime, use_container_width=True, key=f"download_{fmt}")
         else:
-            # 이 경우는 다른 탭에서 파일을 업로드하여 '분석 모드'로 전환된 상태일 수 있습니다.
+            # 저장소에서 데이터셋을 찾을 수 없는 경우입니다.
             st.info("새로운 검색을 시작하려면 아래 버튼을 눌러주세요.")
 
         if st.button("새 검색 시작하기", type="secondary", use_container_width=True):
             # 이 탭 내부의 상태만 초기화합니다.
-            keys_to_delete = ['search_step', 'ui_inputs', 'data_filepath', 'api_email_input', 'or_keywords', 'and_keywords', 'start_year', 'end_year', 'doc_types', 'search_mode']
+            keys_to_delete = ['api_email_input', 'or_keywords', 'and_keywords', 'start_year', 'end_year', 'doc_types', 'search_mode']
             for key in keys_to_delete:
                 if key in st.session_state:
                     del st.session_state[key]
 
-            # 파일 삭제 로직은 그대로 유지
-            filepath = os.path.join("data", "collected_data.jsonl")
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            # 끝난 작업은 목록에서 지우고, 진행 중인 작업만 남깁니다.
+            queue = search_jobs.get_search_job_queue()
+            st.session_state.search_jobs = [job_id for job_id in st.session_state.search_jobs if queue.get(job_id) is not None and queue.get(job_id).is_active]
+            sync_job_query_params()
 
             st.rerun()
\ No newline at end of file